@@ -10,21 +10,35 @@ bl_info = {
 DEBUG = True
 CURRENT_VERSION = ".".join(str(x) for x in bl_info["version"])
 
-import bpy
 import sys
-from . import interfaceManager
-from . import matToVert
-from . import vertexcolorsplitter
-from . import animImporter
-from . import animExporter
-from . import animPanel
+
+try:
+    import bpy
+except ImportError:
+    # Outside Blender only the bpy-free SWToolkit.formats package is usable
+    # (e.g. parsing .anim files on a pipeline server).
+    bpy = None
+
+if bpy is not None:
+    from . import preferences
+    from . import interfaceManager
+    from . import matToVert
+    from . import vertexcolorsplitter
+    from . import animImporter
+    from . import animExporter
+    from . import animPanel
 
 # -------------------------------
 # Hot-reload submodules in debug
 # -------------------------------
-if DEBUG:
+if DEBUG and bpy is not None:
     import importlib
     modules_to_reload = [
+        "formats.anim",
+        "formats.cache",
+        "formats.batch",
+        "formats.optimize",
+        "preferences",
         "interfaceManager",
         "matToVert",
         "vertexcolorsplitter",
@@ -51,6 +65,7 @@ def menu_export(self, context):
 # Register / Unregister
 # -------------------------------
 def register():
+    preferences.register()
     interfaceManager.register()
     matToVert.register()
     vertexcolorsplitter.register()
@@ -76,6 +91,7 @@ def unregister():
     vertexcolorsplitter.unregister()
     matToVert.unregister()
     interfaceManager.unregister()
+    preferences.unregister()
 
     if DEBUG:
         print("[SW Toolkit DEBUG] Addon unregistered")
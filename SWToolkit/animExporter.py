@@ -1,44 +1,47 @@
 import bpy
-import struct
-import math
 import os
+import numpy as np
+from contextlib import contextmanager
 from bpy_extras.io_utils import ExportHelper
-from bpy.props import StringProperty
+from bpy.props import BoolProperty, StringProperty
+from .formats import anim as anim_codec
+from .formats.anim import (
+    ANIM_VERTEX_DTYPE, BLENDER_TO_SW, SUBMESH_HEADER_SIZE,
+    AnimData, AnimSubmesh, linear_to_srgb, load_source,
+)
+from .formats.cache import SubmeshCache
+from .formats.optimize import optimize_indexed
 
 
-# --------------------------
-# Helper
-# --------------------------
-def linear_to_srgb(c):
-    """Convert a linear light channel (0.0–1.0) to a sRGB byte (0–255).
-    Blender FLOAT_COLOR attributes are linear; the .anim file expects sRGB bytes."""
-    c = max(0.0, min(1.0, c))
-    if c <= 0.0031308:
-        srgb = c * 12.92
-    else:
-        srgb = 1.055 * (c ** (1.0 / 2.4)) - 0.055
-    return int(srgb * 255 + 0.5)
+# Encoded submeshes of recent exports, reused while their inputs are unchanged
+_submesh_cache = SubmeshCache()
 
 
 # --------------------------
 # Core export logic
 # --------------------------
-def export_anim(mesh_obj, output_path, context):
+def export_anim(mesh_obj, output_path, context, normalize_weights=False, split_corners=False,
+                optimize_vertex_cache=False, apply_modifiers=False):
     """
     Export the selected mesh object back to a .anim file.
 
-    The mesh object must have been imported via AnimImporter (so it carries
-    the custom properties anim_source_path, anim_file_unknown,
-    anim_submesh_count, anim_submesh_headers).
-
-    The skeleton/animation tail of the original file is preserved verbatim.
+    The mesh object is either imported via AnimImporter (so it carries the
+    custom properties anim_source_path, anim_file_unknown, anim_submesh_count,
+    anim_submesh_headers) or linked with "Select Source .anim", in which case
+    the file-level data comes from the source file itself.
+
+    The mesh is encoded into codec AnimSubmesh arrays and written with
+    formats.anim.write; the skeleton/animation tail of the original file is
+    preserved verbatim. Vertex groups are matched to the source file's bones
+    by name; with normalize_weights the two exported weights sum to 1.
+    split_corners exports per-corner normals, UVs and colors, and
+    optimize_vertex_cache reorders the buffers for rendering (see
+    _encode_submeshes). apply_modifiers exports the object's evaluated
+    mesh, with every modifier except the armature applied.
     """
 
     # --- Recover metadata stored at import time ---
     source_path = mesh_obj.get("anim_source_path", None)
-    file_unknown = mesh_obj.get("anim_file_unknown", 0)
-    submesh_count = mesh_obj.get("anim_submesh_count", 1)
-    flat_headers = mesh_obj.get("anim_submesh_headers", None)
 
     if source_path is None or not os.path.isfile(source_path):
         raise FileNotFoundError(
@@ -47,213 +50,387 @@ def export_anim(mesh_obj, output_path, context):
             "the original file still exists at the same path."
         )
 
+    # Headers, bone names and the skeleton/animation tail come from a
+    # per-process index of the source file, parsed only when it changed.
+    source = load_source(source_path)
+
+    if "anim_submesh_count" in mesh_obj:
+        # Imported mesh: its submesh layout must still match the source
+        file_unknown = mesh_obj.get("anim_file_unknown", source.file_unknown)
+        submesh_count = mesh_obj["anim_submesh_count"]
+        flat_headers = mesh_obj.get("anim_submesh_headers", None)
+        if source.submesh_count != submesh_count:
+            raise ValueError(
+                f"Source .anim has {source.submesh_count} submeshes, "
+                f"but the object was imported with {submesh_count}."
+            )
+    else:
+        # Mesh linked with "Select Source .anim": take the layout from the source
+        file_unknown = source.file_unknown
+        submesh_count = source.submesh_count
+        flat_headers = None
+
+    hits, misses = _submesh_cache.hits, _submesh_cache.misses
+    if apply_modifiers:
+        with _evaluated_mesh(mesh_obj, context) as mesh:
+            new_submesh_data = _encode_submeshes(
+                mesh_obj, mesh, submesh_count, source.bone_names,
+                normalize_weights, split_corners, optimize_vertex_cache,
+            )
+    else:
+        new_submesh_data = _encode_submeshes(
+            mesh_obj, mesh_obj.data, submesh_count, source.bone_names,
+            normalize_weights, split_corners, optimize_vertex_cache,
+        )
+
     # Rebuild per-submesh 10-byte unknown headers
-    if flat_headers and len(flat_headers) == submesh_count * 10:
+    if flat_headers and len(flat_headers) == submesh_count * SUBMESH_HEADER_SIZE:
         submesh_unknown_headers = []
         for si in range(submesh_count):
-            start = si * 10
-            submesh_unknown_headers.append(bytes(flat_headers[start:start + 10]))
+            start = si * SUBMESH_HEADER_SIZE
+            submesh_unknown_headers.append(bytes(flat_headers[start:start + SUBMESH_HEADER_SIZE]))
     else:
-        # Fallback: read them fresh from the source file
-        submesh_unknown_headers = _read_unknown_headers(source_path, submesh_count)
+        # Fallback: the headers read from the source file
+        submesh_unknown_headers = source.submesh_headers
 
-    # Read the skeleton+animation tail from the original file
-    rest_data = _read_rest_data(source_path, submesh_count)
+    submeshes = [
+        AnimSubmesh(submesh_unknown_headers[si], vertices, triangles)
+        for si, (vertices, triangles) in enumerate(new_submesh_data)
+    ]
+    # Skeleton + animation tail, preserved verbatim
+    anim = AnimData(file_unknown, submeshes, source.tail)
 
-    mesh = mesh_obj.data
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    anim_codec.write(anim, output_path)
 
-    # --- Vertex color layer ---
-    color_layer = None
-    if mesh.color_attributes:
-        color_layer = mesh.color_attributes.active_color
-        if color_layer and color_layer.domain != 'POINT':
-            color_layer = None
+    print(f"[AnimExporter] Submesh cache: {_submesh_cache.hits - hits} reused, "
+          f"{_submesh_cache.misses - misses} encoded "
+          f"(session: {_submesh_cache.hits} hits / {_submesh_cache.misses} misses)")
+    print(f"[AnimExporter] ✅ Exported to: {output_path}")
 
-    # --- Group polygons by submesh index, ignoring non-anim materials ---
-    # Build a mapping from Blender material slot index -> anim submesh index.
-    # Only materials named "glass" or "submesh_N" are recognised.
-    # Everything else (e.g. colour materials from matToVert) maps to submesh 0
-    # so the geometry is still exported rather than silently dropped.
-    materials = mesh_obj.data.materials
-    slot_to_submesh = {}
+
+# --------------------------
+# Modifier evaluation
+# --------------------------
+@contextmanager
+def _evaluated_mesh(mesh_obj, context):
+    """
+    Temporary mesh of the object with its modifiers applied, freed on exit.
+
+    Armature modifiers are switched off while the depsgraph evaluates the
+    object, so the bind pose is exported rather than the current pose.
+    """
+    armature_mods = [m for m in mesh_obj.modifiers if m.type == 'ARMATURE' and m.show_viewport]
+    for mod in armature_mods:
+        mod.show_viewport = False
+    try:
+        depsgraph = context.evaluated_depsgraph_get()
+        depsgraph.update()
+        eval_obj = mesh_obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
+    finally:
+        for mod in armature_mods:
+            mod.show_viewport = True
+    try:
+        yield mesh
+    finally:
+        eval_obj.to_mesh_clear()
+
+
+# --------------------------
+# Geometry encoding
+# --------------------------
+def _slot_to_submesh_table(materials):
+    """Array mapping Blender material slot index -> anim submesh index.
+
+    Only materials named "glass" or "submesh_N" are recognised. Everything
+    else (e.g. colour materials from matToVert) maps to submesh 0 so the
+    geometry is still exported rather than silently dropped.
+    """
+    table = np.zeros(len(materials) + 1, dtype=np.int64)  # last entry: out-of-range slots
     for slot_idx, mat in enumerate(materials):
         if mat is None:
-            slot_to_submesh[slot_idx] = 0
             continue
         name = mat.name.lower()
-        if name == "glass":
-            slot_to_submesh[slot_idx] = 0  # glass is always submesh 0
-        elif name.startswith("submesh_"):
+        if name.startswith("submesh_"):
             try:
-                slot_to_submesh[slot_idx] = int(name.split("_", 1)[1])
+                table[slot_idx] = int(name.split("_", 1)[1])
             except ValueError:
-                slot_to_submesh[slot_idx] = 0
-        else:
-            slot_to_submesh[slot_idx] = 0  # unrecognised → default submesh
+                pass
+        # "glass" is always submesh 0, like unrecognised materials
+    return table
 
-    material_polygons = {}
-    for poly in mesh.polygons:
-        si = slot_to_submesh.get(poly.material_index, 0)
-        if si not in material_polygons:
-            material_polygons[si] = []
-        material_polygons[si].append(poly)
 
-    # --- Build per-submesh vertex + triangle bytes ---
-    new_submesh_data = []
+def _polygon_loops(loop_starts, loop_totals):
+    """Loop indices of every polygon in polygon order, and the polygon of each."""
+    loop_poly = np.repeat(np.arange(len(loop_starts)), loop_totals)
+    offsets = np.cumsum(loop_totals) - loop_totals
+    loop_indices = np.repeat(loop_starts - offsets, loop_totals) + np.arange(len(loop_poly))
+    return loop_indices, loop_poly
 
-    for si in range(submesh_count):
-        polygons = material_polygons.get(si, [])
 
-        if not polygons:
-            new_submesh_data.append({'vertices': b'', 'triangles': b''})
-            continue
+def _first_loop_uvs(uv_data, loop_indices, loop_vertices, loop_submesh, num_verts):
+    """Per-vertex UVs taken from the first loop (in polygon order) of each submesh
+    that references the vertex.
 
-        # Collect unique vertex indices used by this submesh's faces
-        used_vertices = set()
-        for poly in polygons:
-            used_vertices.update(poly.vertices)
-
-        # Build a local index mapping: global vertex idx -> submesh-local idx
-        vertex_remap = {}
-        ordered_vertices = []
-        for gvi in used_vertices:
-            vertex_remap[gvi] = len(ordered_vertices)
-            ordered_vertices.append(gvi)
-
-        vertices_bytes = b""
-        for gvi in ordered_vertices:
-            v = mesh.vertices[gvi]
-            co = mesh_obj.matrix_world @ v.co
-            normal = v.normal
-
-            # Export transform: rotate X 90deg then scale X -1.
-            # Verified: sw_x = -co.x, sw_y = -co.z, sw_z = co.y
-            sw_x = -co.x
-            sw_y = co.z
-            sw_z = -co.y
-
-            sw_nx = -normal.x
-            sw_ny = normal.z
-            sw_nz = -normal.y
-
-            # Vertex color
-            if color_layer:
-                c = color_layer.data[gvi].color
-                color = (
-                    linear_to_srgb(c[0]),
-                    linear_to_srgb(c[1]),
-                    linear_to_srgb(c[2]),
-                    int(max(0.0, min(1.0, c[3])) * 255 + 0.5) if len(c) >= 4 else 255,  # alpha: no gamma
-                )
-            else:
-                color = (255, 255, 255, 255)
-
-            # UV — use first UV layer if present, else (0, 0)
-            uv = (0.0, 0.0)
-            if mesh.uv_layers.active:
-                # UV is per-loop; use the first loop that references this vertex
-                for poly in polygons:
-                    for li, vi in zip(poly.loop_indices, poly.vertices):
-                        if vi == gvi:
-                            uv_data = mesh.uv_layers.active.data[li].uv
-                            uv = (uv_data[0], uv_data[1])
-                            break
-                    else:
-                        continue
-                    break
-
-            # Bone weights from vertex groups
-            b1, b2, w1, w2 = 0, 0, 1.0, 0.0
-            groups = sorted(v.groups, key=lambda g: g.weight, reverse=True)
-            if len(groups) > 0:
-                b1 = groups[0].group
-                w1 = groups[0].weight
-            if len(groups) > 1:
-                b2 = groups[1].group
-                w2 = groups[1].weight
-
-            vertices_bytes += struct.pack(
-                "<3f4B2f3f4f",
-                sw_x, sw_y, sw_z,
-                color[0], color[1], color[2], color[3],
-                uv[0], uv[1],
-                sw_nx, sw_ny, sw_nz,
-                float(b1), float(b2),
-                w1, w2,
-            )
+    Returns (keys, uvs) sorted by key = submesh * num_verts + vertex, built
+    in one pass over all loops.
+    """
+    keys = loop_submesh * num_verts + loop_vertices[loop_indices]
+    keys, first = np.unique(keys, return_index=True)
+    return keys, uv_data[loop_indices[first]]
+
+
+def _color_attribute_srgb(mesh):
+    """(N, 4) uint8 sRGB colors of the active color attribute and its domain,
+    or (None, None) if there is no POINT or CORNER color attribute."""
+    color_layer = mesh.color_attributes.active_color if mesh.color_attributes else None
+    if color_layer is None or color_layer.domain not in {'POINT', 'CORNER'}:
+        return None, None
+    linear = np.empty(len(color_layer.data) * 4, dtype=np.float32)
+    color_layer.data.foreach_get("color", linear)
+    linear = linear.reshape(-1, 4)
+    colors = np.empty((len(linear), 4), dtype=np.uint8)
+    colors[:, :3] = linear_to_srgb(linear[:, :3])
+    colors[:, 3] = (np.clip(linear[:, 3], 0.0, 1.0) * 255 + 0.5).astype(np.uint8)  # alpha: no gamma
+    return colors, color_layer.domain
+
+
+def _dedup_records(records):
+    """Unique 52-byte records and, for every input record, its index among them."""
+    raw = np.ascontiguousarray(records).view(np.dtype((np.void, records.dtype.itemsize)))
+    _, first, inverse = np.unique(raw, return_index=True, return_inverse=True)
+    return records[first], inverse.ravel()
+
+
+def _vertex_bone_weights(mesh_obj, mesh, bone_names, normalize=False):
+    """
+    The two strongest (bone, weight) pairs of every vertex, as (V, 2) arrays.
 
-        tri_bytes = b""
-        for poly in polygons:
-            if len(poly.vertices) == 3:
-                remapped = [vertex_remap[vi] for vi in poly.vertices]
-                tri_bytes += struct.pack("<3I", *remapped)
+    Vertex groups are mapped to bones by name through the source skeleton, so
+    the group order on the object doesn't matter and groups that aren't bones
+    are ignored. Memberships are read in one pass into a padded vertex x slot
+    table and the top two per row are picked with a stable sort, so ties keep
+    the vertex's group order as before. Vertices without weights get bone 0 at weight 1.
+    """
+    num_verts = len(mesh.vertices)
+    bones = np.zeros((num_verts, 2), dtype=np.float32)
+    weights = np.zeros((num_verts, 2), dtype=np.float32)
+    weights[:, 0] = 1.0
+
+    bone_lookup = {name: bi for bi, name in enumerate(bone_names)}
+    group_to_bone = np.array([bone_lookup.get(vg.name, -1) for vg in mesh_obj.vertex_groups], dtype=np.int64)
+    unmatched = [vg.name for vg in mesh_obj.vertex_groups if vg.name not in bone_lookup]
+    if unmatched:
+        print(f"[AnimExporter] ⚠️ Ignoring vertex groups with no matching bone: {', '.join(unmatched)}")
+    if not len(group_to_bone) or len(unmatched) == len(group_to_bone):
+        return bones, weights
+
+    # --- Flat (vertex, group, weight) membership table ---
+    entries = np.array(
+        [(v.index, g.group, g.weight) for v in mesh.vertices for g in v.groups],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    entry_vertex = entries[:, 0].astype(np.int64)
+    entry_group = entries[:, 1].astype(np.int64)
+    valid = entry_group < len(group_to_bone)
+    valid[valid] = group_to_bone[entry_group[valid]] >= 0
+    entry_vertex = entry_vertex[valid]
+    entry_bone = group_to_bone[entry_group[valid]]
+    entry_weight = entries[valid, 2]
+    if not len(entry_vertex):
+        return bones, weights
+
+    # --- Pad into a (V, width) table, one row per vertex ---
+    counts = np.bincount(entry_vertex, minlength=num_verts)
+    slot = np.arange(len(entry_vertex)) - (np.cumsum(counts) - counts)[entry_vertex]
+    width = max(int(counts.max()), 2)
+    table_weight = np.full((num_verts, width), -np.inf)
+    table_bone = np.zeros((num_verts, width), dtype=np.int64)
+    table_weight[entry_vertex, slot] = entry_weight
+    table_bone[entry_vertex, slot] = entry_bone
+
+    # --- Top two per vertex, strongest first ---
+    # A stable sort keeps tied weights in the vertex's group order
+    top = np.argsort(-table_weight, axis=1, kind='stable')[:, :2]
+    top_weight = np.take_along_axis(table_weight, top, axis=1)
+    top_bone = np.take_along_axis(table_bone, top, axis=1)
+
+    present = np.isfinite(top_weight)
+    weighted = present[:, 0]
+    bones[weighted] = np.where(present[weighted], top_bone[weighted], 0)
+    weights[weighted] = np.where(present[weighted], top_weight[weighted], 0.0)
+
+    if normalize:
+        totals = weights.sum(axis=1)
+        scale = weighted & (totals > 0)
+        weights[scale] /= totals[scale, None]
+
+    return bones, weights
+
+
+def _encode_submeshes(mesh_obj, mesh, submesh_count, bone_names, normalize_weights=False, split_corners=False,
+                      optimize_vertex_cache=False):
+    """
+    Encode `mesh` (the object's own data, or an evaluated copy of it) into
+    per-submesh (vertices, triangles) codec arrays.
 
-        new_submesh_data.append({'vertices': vertices_bytes, 'triangles': tri_bytes})
-        print(f"[AnimExporter] Submesh {si}: {len(ordered_vertices)} verts, {len(polygons)} tris")
+    By default there is one record per mesh vertex, with the vertex normal and
+    the UV of its first face corner. With split_corners a record is built for
+    every face corner instead (corner normal, corner UV and color) and
+    identical records are merged, so UV seams, hard edges and CORNER colors
+    survive with the fewest vertices that can represent them.
 
-    # --- Assemble the new file ---
-    new_data = b'anim'
-    new_data += struct.pack("<I", file_unknown)
-    new_data += struct.pack("<I", submesh_count)
+    optimize_vertex_cache reorders each submesh's triangles for the GPU
+    vertex cache and its vertices by first use (see formats.optimize).
+    """
+    num_verts = len(mesh.vertices)
+    num_polys = len(mesh.polygons)
+
+    # --- Bulk reads ---
+    co = np.empty(num_verts * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    normals = np.empty(num_verts * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("normal", normals)
+
+    loop_starts = np.empty(num_polys, dtype=np.int64)
+    loop_totals = np.empty(num_polys, dtype=np.int64)
+    material_indices = np.empty(num_polys, dtype=np.int64)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    mesh.polygons.foreach_get("material_index", material_indices)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+    # Quads and n-gons are exported through Blender's own tessellation;
+    # loop triangles are a derived cache, so the mesh itself is not modified.
+    mesh.calc_loop_triangles()
+    num_tris = len(mesh.loop_triangles)
+    tri_vertices = np.empty(num_tris * 3, dtype=np.int64)
+    tri_polygons = np.empty(num_tris, dtype=np.int64)
+    mesh.loop_triangles.foreach_get("vertices", tri_vertices)
+    mesh.loop_triangles.foreach_get("polygon_index", tri_polygons)
+    tri_vertices = tri_vertices.reshape(-1, 3)
+
+    # World matrix and Blender -> SW axis swap as one affine transform.
+    # Normals only get the axis swap.
+    transform = BLENDER_TO_SW.astype(np.float64) @ np.array(mesh_obj.matrix_world, dtype=np.float64)[:3]
+    positions = co.reshape(-1, 3) @ transform[:, :3].T + transform[:, 3]
+    normals = normals.reshape(-1, 3) @ BLENDER_TO_SW.T
+
+    colors, color_domain = _color_attribute_srgb(mesh)
+    if color_domain == 'CORNER' and not split_corners:
+        colors = None  # per-vertex records can't hold corner colors
+    vertex_bones, vertex_weights = _vertex_bone_weights(mesh_obj, mesh, bone_names, normalize_weights)
+
+    uv_data = None
+    if mesh.uv_layers.active:
+        uv_data = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uv_data)
+        uv_data = uv_data.reshape(-1, 2)
+
+    # --- Per-corner data ---
+    if split_corners:
+        tri_loops = np.empty(num_tris * 3, dtype=np.int64)
+        mesh.loop_triangles.foreach_get("loops", tri_loops)
+        tri_loops = tri_loops.reshape(-1, 3)
+        corner_normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+        mesh.corner_normals.foreach_get("vector", corner_normals)
+        corner_normals = corner_normals.reshape(-1, 3) @ BLENDER_TO_SW.T
+        if color_domain == 'POINT':
+            colors = colors[loop_vertices]
+        loop_to_local = np.empty(len(mesh.loops), dtype=np.int64)
 
-    for si in range(submesh_count):
-        sd = new_submesh_data[si]
-        new_data += submesh_unknown_headers[si]
-        new_data += struct.pack("<I", len(sd['vertices']))
-        new_data += sd['vertices']
-        new_data += struct.pack("<I", len(sd['triangles']))
-        new_data += sd['triangles']
+    # --- Group polygons by submesh index, ignoring non-anim materials ---
+    slot_to_submesh = _slot_to_submesh_table(mesh.materials)
+    poly_submesh = slot_to_submesh[np.minimum(material_indices, len(slot_to_submesh) - 1)]
+    loop_indices, loop_poly = _polygon_loops(loop_starts, loop_totals)
+    loop_submesh = poly_submesh[loop_poly]
+    tri_submesh = poly_submesh[tri_polygons]
 
-    new_data += rest_data
+    if uv_data is not None and not split_corners:
+        uv_keys, uv_table = _first_loop_uvs(uv_data, loop_indices, loop_vertices, loop_submesh, num_verts)
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'wb') as f:
-        f.write(new_data)
+    # --- Build per-submesh vertex + triangle arrays ---
+    new_submesh_data = []
 
-    print(f"[AnimExporter] ✅ Exported to: {output_path}")
+    for si in range(submesh_count):
+        sub_loops = loop_indices[loop_submesh == si]
 
+        if not len(sub_loops):
+            new_submesh_data.append((np.empty(0, ANIM_VERTEX_DTYPE), np.empty((0, 3), np.uint32)))
+            continue
 
-# --------------------------
-# Read helpers (parse source file minimally)
-# --------------------------
-def _read_unknown_headers(source_path, submesh_count):
-    """Re-read only the 10-byte unknown headers from the source file."""
-    with open(source_path, 'rb') as f:
-        data = f.read()
+        # Reuse the encoded buffers if none of this submesh's inputs changed.
+        # Positions are hashed after the world transform, so moving the
+        # object invalidates its submeshes too.
+        used_vertices = np.unique(loop_vertices[sub_loops])
+        tri_mask = tri_submesh == si
+        key = SubmeshCache.content_key(
+            si, split_corners, normalize_weights, optimize_vertex_cache,
+            sub_loops, loop_vertices[sub_loops], tri_vertices[tri_mask],
+            tri_loops[tri_mask] if split_corners else None,
+            positions[used_vertices], vertex_bones[used_vertices], vertex_weights[used_vertices],
+            corner_normals[sub_loops] if split_corners else normals[used_vertices],
+            None if colors is None else colors[sub_loops] if split_corners else colors[used_vertices],
+            None if uv_data is None else uv_data[sub_loops],
+        )
+        cached = _submesh_cache.get(key)
+        if cached is not None:
+            new_submesh_data.append(cached)
+            print(f"[AnimExporter] Submesh {si}: unchanged, reusing encoded buffers")
+            continue
 
-    offset = 4  # skip magic
-    offset += 4  # file_unknown
-    offset += 4  # submesh_count
+        if split_corners:
+            # One record per face corner, then merge identical ones
+            corner_vertices = loop_vertices[sub_loops]
+            records = np.empty(len(sub_loops), dtype=ANIM_VERTEX_DTYPE)
+            records['pos'] = positions[corner_vertices]
+            records['normal'] = corner_normals[sub_loops]
+            records['color'] = colors[sub_loops] if colors is not None else 255
+            records['uv'] = uv_data[sub_loops] if uv_data is not None else 0.0
+            records['bones'] = vertex_bones[corner_vertices]
+            records['weights'] = vertex_weights[corner_vertices]
+            records, record_index = _dedup_records(records)
+
+            loop_to_local[sub_loops] = record_index
+            triangles = loop_to_local[tri_loops[tri_mask]].astype(np.uint32)
+            print(f"[AnimExporter] Submesh {si}: {len(sub_loops)} corners -> "
+                  f"{len(records)} verts, {len(triangles)} tris")
+        else:
+            # Unique vertices used by this submesh's faces, in ascending order;
+            # being sorted, the array doubles as the global -> local index map.
+            ordered_vertices = used_vertices
 
-    headers = []
-    for _ in range(submesh_count):
-        headers.append(data[offset:offset + 10])
-        offset += 10
-        (vsz,) = struct.unpack_from("<I", data, offset)
-        offset += 4 + vsz
-        (tsz,) = struct.unpack_from("<I", data, offset)
-        offset += 4 + tsz
+            records = np.empty(len(ordered_vertices), dtype=ANIM_VERTEX_DTYPE)
+            records['pos'] = positions[ordered_vertices]
+            records['normal'] = normals[ordered_vertices]
+            records['color'] = colors[ordered_vertices] if colors is not None else 255
 
-    return headers
+            # UV — use first UV layer if present, else (0, 0)
+            if uv_data is not None:
+                records['uv'] = uv_table[np.searchsorted(uv_keys, si * num_verts + ordered_vertices)]
+            else:
+                records['uv'] = 0.0
 
+            # Bone weights from vertex groups
+            records['bones'] = vertex_bones[ordered_vertices]
+            records['weights'] = vertex_weights[ordered_vertices]
 
-def _read_rest_data(source_path, submesh_count):
-    """Return everything after the last submesh (bones + animation data)."""
-    with open(source_path, 'rb') as f:
-        data = f.read()
+            # Loop triangles of this submesh's polygons, in polygon order
+            triangles = np.searchsorted(ordered_vertices, tri_vertices[tri_mask]).astype(np.uint32)
+            print(f"[AnimExporter] Submesh {si}: {len(ordered_vertices)} verts, {len(triangles)} tris")
 
-    offset = 4  # skip magic
-    offset += 4  # file_unknown
-    offset += 4  # submesh_count
+        if optimize_vertex_cache:
+            records, triangles, stats = optimize_indexed(records, triangles)
+            print(f"[AnimExporter] Submesh {si} vertex cache: "
+                  f"ACMR {stats['acmr_before']:.3f} -> {stats['acmr_after']:.3f}, "
+                  f"ATVR {stats['atvr_before']:.3f} -> {stats['atvr_after']:.3f}")
 
-    for _ in range(submesh_count):
-        offset += 10  # unknown header
-        (vsz,) = struct.unpack_from("<I", data, offset)
-        offset += 4 + vsz
-        (tsz,) = struct.unpack_from("<I", data, offset)
-        offset += 4 + tsz
+        _submesh_cache.put(key, records, triangles)
+        new_submesh_data.append((records, triangles))
 
-    return data[offset:]
+    return new_submesh_data
 
 
 # --------------------------
@@ -268,6 +445,33 @@ class ANIMIO_OT_export(bpy.types.Operator, ExportHelper):
     filename_ext = ".anim"
     filter_glob: StringProperty(default="*.anim", options={'HIDDEN'})
 
+    normalize_weights: BoolProperty(
+        name="Normalize Weights",
+        description="Scale each vertex's two exported bone weights so they sum to 1",
+        default=False
+    )
+
+    split_corners: BoolProperty(
+        name="Split Vertices at Seams",
+        description="Export per-corner normals, UVs and colors, duplicating vertices only where "
+                    "they differ (keeps hard edges, UV seams and face corner colors)",
+        default=False
+    )
+
+    optimize_vertex_cache: BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Reorder triangles for the GPU vertex cache and vertices by first use "
+                    "(slower export; ACMR/ATVR are printed to the console)",
+        default=False
+    )
+
+    apply_modifiers: BoolProperty(
+        name="Apply Modifiers",
+        description="Export the mesh with its modifiers applied (armature modifiers excluded, "
+                    "so the bind pose is exported); the object itself is not changed",
+        default=False
+    )
+
     def execute(self, context):
         obj = context.active_object
         if obj is None or obj.type != 'MESH':
@@ -275,7 +479,11 @@ class ANIMIO_OT_export(bpy.types.Operator, ExportHelper):
             return {'CANCELLED'}
 
         try:
-            export_anim(obj, self.filepath, context)
+            export_anim(
+                obj, self.filepath, context,
+                self.normalize_weights, self.split_corners, self.optimize_vertex_cache,
+                self.apply_modifiers,
+            )
             self.report({'INFO'}, f"Exported: {os.path.basename(self.filepath)}")
         except FileNotFoundError as e:
             self.report({'ERROR'}, str(e))
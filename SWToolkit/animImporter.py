@@ -1,201 +1,163 @@
 import bpy
-import struct
+import hashlib
 import mathutils
-import math
 import os
+import time
+import numpy as np
 from bpy_extras.io_utils import ImportHelper
-from bpy.props import StringProperty
+from bpy.props import BoolProperty, CollectionProperty, StringProperty
+from .formats.anim import NO_PARENT, bone_heads_tails
+from .formats.batch import decode_many
+from .formats.cache import read_mesh_arrays_cached
+from .preferences import get_anim_cache
 
 
-# --------------------------
-# Helper functions
-# --------------------------
-def safe_unpack(fmt, data, offset):
-    size = struct.calcsize(fmt)
-    if offset + size > len(data):
-        return None, offset
-    return struct.unpack_from(fmt, data, offset), offset + size
-
-
-def srgb_to_linear(c):
-    """Convert a single sRGB channel (0.0–1.0) to linear light.
-    The .anim file stores raw sRGB bytes; Blender FLOAT_COLOR attributes are
-    linear, so we must un-gamma on import and re-gamma on export."""
-    c = max(0.0, min(1.0, c))
-    if c <= 0.04045:
-        return c / 12.92
-    return ((c + 0.055) / 1.055) ** 2.4
+# The object correction on its own, used to derive bone rolls. It is its own
+# inverse, so it also maps converted directions back.
+BONE_AXIS_CORRECTION = mathutils.Matrix((
+    (1.0, 0.0, 0.0),
+    (0.0, 0.0, -1.0),
+    (0.0, -1.0, 0.0),
+))
 
 
-def safe_decode(data, offset, length, encoding='ascii'):
-    try:
-        return data[offset:offset + length].decode(encoding)
-    except UnicodeDecodeError:
-        return data[offset:offset + length].decode('latin-1')
+# --------------------------
+# Bulk mesh construction
+# --------------------------
+def build_mesh(mesh_data, positions, triangles, material_indices):
+    """Fill an empty mesh from contiguous arrays in a handful of foreach_set calls.
+
+    positions: (V, 3) float, triangles: (F, 3) int, material_indices: (F,) int.
+    Blender derives each polygon's loop_total from the loop_start offsets, so
+    only the starts need to be written.
+    """
+    num_tris = len(triangles)
+    mesh_data.vertices.add(len(positions))
+    mesh_data.loops.add(num_tris * 3)
+    mesh_data.polygons.add(num_tris)
+
+    mesh_data.vertices.foreach_set("co", np.ascontiguousarray(positions, dtype=np.float32).ravel())
+    mesh_data.loops.foreach_set("vertex_index", np.ascontiguousarray(triangles, dtype=np.int32).ravel())
+    mesh_data.polygons.foreach_set("loop_start", np.arange(0, num_tris * 3, 3, dtype=np.int32))
+    mesh_data.polygons.foreach_set("material_index", np.ascontiguousarray(material_indices, dtype=np.int32))
+
+    mesh_data.update(calc_edges=True)
+
+
+def bucket_vertex_weights(vertex_bones, vertex_weights, bone_count):
+    """Group the two (bone, weight) slots of every vertex into add() buckets.
+
+    Returns a list of (bone_index, weight, vertex_indices) with one entry per
+    distinct (bone, weight) pair. Slot 2 replaces slot 1 when both reference
+    the same bone, matching the order the weights are stored in the file.
+    """
+    b1, b2 = vertex_bones[:, 0], vertex_bones[:, 1]
+    w1, w2 = vertex_weights[:, 0], vertex_weights[:, 1]
+    valid1 = (b1 >= 0) & (b1 < bone_count) & (w1 > 0)
+    valid2 = (b2 >= 0) & (b2 < bone_count) & (w2 > 0)
+    valid1 &= ~(valid2 & (b1 == b2))
+
+    vert_idx = np.arange(len(vertex_bones), dtype=np.int32)
+    indices = np.concatenate((vert_idx[valid1], vert_idx[valid2]))
+    bone_ids = np.concatenate((b1[valid1], b2[valid2]))
+    weights = np.concatenate((w1[valid1], w2[valid2]))
+    if not len(indices):
+        return []
+
+    order = np.lexsort((weights, bone_ids))
+    indices, bone_ids, weights = indices[order], bone_ids[order], weights[order]
+    starts = np.flatnonzero(np.r_[True, (np.diff(bone_ids) != 0) | (np.diff(weights) != 0)])
+    ends = np.r_[starts[1:], len(indices)]
+
+    return [
+        (int(bone_ids[s]), float(weights[s]), indices[s:e].tolist())
+        for s, e in zip(starts, ends)
+    ]
+
+
+def assign_vertex_weights(mesh_obj, bone_names, vertex_bones, vertex_weights):
+    """Write skin weights with one vertex_groups add() call per (bone, weight) bucket."""
+    groups = [mesh_obj.vertex_groups[name] for name in bone_names]
+    for bone_idx, weight, indices in bucket_vertex_weights(vertex_bones, vertex_weights, len(bone_names)):
+        groups[bone_idx].add(indices, weight, 'REPLACE')
 
 
 # --------------------------
 # Core import logic
 # --------------------------
 def import_anim(anim_path, context):
-    with open(anim_path, 'rb') as f:
-        data = f.read()
-
-    offset = 0
-
-    # --- File header ---
-    magic = data[offset:offset + 4]
-    offset += 4
-    if magic != b'anim':
-        raise ValueError("Not a valid .anim file")
-
-    res, offset = safe_unpack("<I", data, offset)
-    file_unknown = res[0]
+    """Decode an .anim file with the codec and build its mesh and armature."""
+    t_start = time.perf_counter()
+    arrays = load_mesh_arrays(anim_path, context)
+    print(f"[AnimImporter] Header: unknown={arrays.file_unknown}, submesh_count={arrays.submesh_count}")
+    print(f"[AnimImporter] {len(arrays.positions)} verts, {len(arrays.triangles)} faces, "
+          f"{len(arrays.skeleton)} bones")
+    t_parsed = time.perf_counter()
+
+    mesh_obj, arm_obj = create_anim_objects(arrays, anim_path, context)
+
+    print(f"[AnimImporter] ⏱ parse {(t_parsed - t_start) * 1000:.1f} ms | "
+          f"total {(time.perf_counter() - t_start) * 1000:.1f} ms")
+    print("[AnimImporter] 🎉 Import complete!")
+    return mesh_obj, arm_obj
 
-    res, offset = safe_unpack("<I", data, offset)
-    submesh_count = res[0]
 
-    print(f"[AnimImporter] Header: unknown={file_unknown}, submesh_count={submesh_count}")
+def load_mesh_arrays(anim_path, context):
+    """Decode an .anim file, going through the on-disk cache when it is enabled."""
+    return read_mesh_arrays_cached(anim_path, get_anim_cache(context))
 
-    # --- Submeshes ---
-    all_vertices = []
-    all_triangles = []
-    vertex_global_offset = 0
-    submesh_face_ranges = []
-    submesh_unknown_headers = []
 
-    for si in range(submesh_count):
-        print(f"[AnimImporter] Parsing submesh {si} at offset {offset}")
-        unknown_header = data[offset:offset + 10]
-        submesh_unknown_headers.append(unknown_header)
-        offset += 10
-
-        res, offset = safe_unpack("<I", data, offset)
-        vertex_section_size = res[0]
-        vertex_section_start = offset
-        vertex_section_end = vertex_section_start + vertex_section_size
-
-        local_vertices = []
-        while offset + 52 <= vertex_section_end:
-            res, offset = safe_unpack("<3f", data, offset)
-            x, y, z = res
-            res, offset = safe_unpack("<4B", data, offset)
-            r, g, b, a = res
-            res, offset = safe_unpack("<2f", data, offset)
-            u, v = res
-            res, offset = safe_unpack("<3f", data, offset)
-            nx, ny, nz = res
-            res, offset = safe_unpack("<2f", data, offset)
-            b1f, b2f = res
-            res, offset = safe_unpack("<2f", data, offset)
-            w1, w2 = res
-
-            bone1 = int(b1f)
-            bone2 = int(b2f)
-
-            # SW → Blender: negate X and Y
-            local_vertices.append({
-                'pos': (-x, -y, z),
-                'color': (
-                    srgb_to_linear(r / 255.0),
-                    srgb_to_linear(g / 255.0),
-                    srgb_to_linear(b / 255.0),
-                    a / 255.0,  # alpha is not gamma-corrected
-                ),
-                'uv': (u, v),
-                'normal': (-nx, -ny, nz),
-                'bones': (bone1, bone2),
-                'weights': (w1, w2)
-            })
-
-        offset = vertex_section_end
-
-        res, offset = safe_unpack("<I", data, offset)
-        tri_section_size = res[0]
-        tri_section_start = offset
-        tri_section_end = tri_section_start + tri_section_size
-
-        local_triangles = []
-        while offset + 12 <= tri_section_end:
-            res, offset = safe_unpack("<3I", data, offset)
-            i1, i2, i3 = res
-            local_triangles.append((
-                i1 + vertex_global_offset,
-                i2 + vertex_global_offset,
-                i3 + vertex_global_offset
-            ))
-
-        offset = tri_section_end
-
-        start_idx = len(all_triangles)
-        all_triangles.extend(local_triangles)
-        end_idx = len(all_triangles)
-        submesh_face_ranges.append((si, start_idx, end_idx))
-
-        all_vertices.extend(local_vertices)
-        vertex_global_offset += len(local_vertices)
-
-        print(f"[AnimImporter] Submesh {si}: {len(local_vertices)} verts, {len(local_triangles)} faces")
-
-    # --- Bones ---
-    res, offset = safe_unpack("<I", data, offset)
-    total_bones = res[0] if res else 0
-    bones = []
-
-    for bi in range(total_bones):
-        res, offset = safe_unpack("<H", data, offset)
-        name_len = res[0]
-        name = safe_decode(data, offset, name_len)
-        offset += name_len
-        res, offset = safe_unpack("<12f", data, offset)
-        matrix = res
-        res, offset = safe_unpack("<I", data, offset)
-        parent_id = res[0]
-        res, offset = safe_unpack("<I", data, offset)
-        child_count = res[0]
-        children = []
-        for _ in range(child_count):
-            res, offset = safe_unpack("<I", data, offset)
-            children.append(res[0])
-        bones.append({
-            'name': name,
-            'matrix': matrix,
-            'parent': parent_id,
-            'children': children
-        })
-
-    print(f"[AnimImporter] Total bones: {len(bones)}")
-
-    # --- World positions ---
-    world_positions = {}
-
-    def get_world_position(idx):
-        if idx in world_positions:
-            return world_positions[idx]
-        b = bones[idx]
-        mat = b['matrix']
-        # SW → Blender: negate X and Y
-        head_local = mathutils.Vector((-mat[9], -mat[10], mat[11]))
-        if b['parent'] == 0xFFFFFFFF:
-            world_positions[idx] = head_local
-        else:
-            world_positions[idx] = get_world_position(b['parent']) + head_local
-        return world_positions[idx]
+def import_anim_batch(anim_paths, context, update_existing=False):
+    """
+    Import many .anim files at once.
 
-    for idx in range(len(bones)):
-        get_world_position(idx)
-
-    # --- Cleanup old data ---
-    base_name = os.path.splitext(os.path.basename(anim_path))[0]
-    for datablock in (bpy.data.objects, bpy.data.meshes, bpy.data.armatures):
-        if base_name in datablock:
-            datablock.remove(datablock[base_name])
-    if f"{base_name}_Armature" in bpy.data.armatures:
-        bpy.data.armatures.remove(bpy.data.armatures[f"{base_name}_Armature"])
-    if f"{base_name}_ArmatureObj" in bpy.data.objects:
-        bpy.data.objects.remove(bpy.data.objects[f"{base_name}_ArmatureObj"])
+    Files are decoded in parallel worker processes; the Blender datablocks
+    are created here on the main thread as each result arrives. With
+    update_existing, meshes already imported from a file are refreshed in
+    place instead of being recreated.
+    Returns (imported, failed) lists of (path, result or error).
+    """
+    t_start = time.perf_counter()
+    wm = context.window_manager
+    wm.progress_begin(0, len(anim_paths))
+    imported = []
+    failed = []
+    try:
+        for done, (path, arrays, error) in enumerate(decode_many(anim_paths, get_anim_cache(context)), 1):
+            if error is None:
+                try:
+                    targets = find_imported_meshes(path) if update_existing else []
+                    if targets:
+                        result = [refresh_anim_objects(arrays, obj, path, context) for obj in targets]
+                    else:
+                        result = create_anim_objects(arrays, path, context)
+                    imported.append((path, result))
+                except Exception as e:
+                    error = e
+            if error is not None:
+                print(f"[AnimImporter] ❌ {os.path.basename(path)}: {error}")
+                failed.append((path, error))
+            wm.progress_update(done)
+    finally:
+        wm.progress_end()
+
+    print(f"[AnimImporter] ⏱ batch of {len(anim_paths)} files: "
+          f"{(time.perf_counter() - t_start) * 1000:.1f} ms")
+    return imported, failed
+
+
+def find_shared_armature(context, fingerprint):
+    """An armature in the scene that was built from an identical bone table."""
+    for obj in context.scene.objects:
+        if obj.type == 'ARMATURE' and obj.get("anim_skeleton_hash") == fingerprint:
+            return obj
+    return None
+
+
+def build_armature(skeleton, base_name, context):
+    """Create an armature object for a skeleton (needs one edit-mode session)."""
+    heads, tails = bone_heads_tails(skeleton)
 
-    # --- Create Armature ---
     arm_data = bpy.data.armatures.new(f"{base_name}_Armature")
     arm_obj = bpy.data.objects.new(f"{base_name}_ArmatureObj", arm_data)
     context.collection.objects.link(arm_obj)
@@ -203,134 +165,346 @@ def import_anim(anim_path, context):
     bpy.ops.object.mode_set(mode='EDIT')
 
     edit_bones = arm_obj.data.edit_bones
-    bone_refs = {}
-    for idx, b in enumerate(bones):
-        eb = edit_bones.new(b['name'])
-        bone_refs[idx] = eb
-        head = world_positions[idx]
+    bone_refs = []
+    for name, head, tail in zip(skeleton.names, heads.tolist(), tails.tolist()):
+        eb = edit_bones.new(name)
+        bone_refs.append(eb)
         eb.head = head
-        if b['children']:
-            cx = cy = cz = 0.0
-            for cidx in b['children']:
-                c = world_positions[cidx]
-                cx += c.x
-                cy += c.y
-                cz += c.z
-            n = len(b['children'])
-            eb.tail = mathutils.Vector((cx / n, cy / n, cz / n))
-        else:
-            eb.tail = head + mathutils.Vector((0, 0, 0.05))
+        eb.tail = tail
+        # Give the bone the roll it would get from being built uncorrected and
+        # then having the object correction applied to it.
+        unconverted = bpy.types.Bone.MatrixFromAxisRoll(BONE_AXIS_CORRECTION @ (eb.tail - eb.head), 0.0)
+        eb.roll = bpy.types.Bone.AxisRollFromMatrix(BONE_AXIS_CORRECTION @ unconverted)[1]
 
-    for idx, b in enumerate(bones):
-        if b['parent'] != 0xFFFFFFFF:
-            bone_refs[idx].parent = bone_refs[b['parent']]
+    for idx, parent in enumerate(skeleton.parents.tolist()):
+        if parent != NO_PARENT:
+            bone_refs[idx].parent = bone_refs[parent]
 
     bpy.ops.object.mode_set(mode='OBJECT')
-    print("[AnimImporter] ✅ Armature created")
-
-    # --- Create Mesh ---
-    mesh_data = bpy.data.meshes.new(base_name)
-    mesh_obj = bpy.data.objects.new(base_name, mesh_data)
-    context.collection.objects.link(mesh_obj)
-
-    verts = [v['pos'] for v in all_vertices]
-    mesh_data.from_pydata(verts, [], all_triangles)
-    mesh_data.update()
-    print("[AnimImporter] ✅ Mesh created")
-
-    # --- Materials per submesh ---
-    # Submesh 0 is glass if there are multiple submeshes, otherwise default
-    for si, start, end in submesh_face_ranges:
-        if submesh_count > 1 and si == 0:
-            mat_name = "glass"
-            glass_mat = bpy.data.materials.get(mat_name) or bpy.data.materials.new(name=mat_name)
-            glass_mat.use_nodes = True
-            bsdf = glass_mat.node_tree.nodes.get("Principled BSDF")
-            if bsdf and "Transmission" in bsdf.inputs:
-                bsdf.inputs["Transmission"].default_value = 1.0
-            mesh_data.materials.append(glass_mat)
-        else:
-            mat_name = f"submesh_{si}"
-            mat = bpy.data.materials.get(mat_name) or bpy.data.materials.new(name=mat_name)
-            mesh_data.materials.append(mat)
-
-    for si, start, end in submesh_face_ranges:
-        for fi in range(start, end):
-            mesh_data.polygons[fi].material_index = si
-
-    # --- Vertex colors ---
-    if "Col" in mesh_data.color_attributes:
-        color_layer = mesh_data.color_attributes["Col"]
-    else:
+    arm_obj["anim_skeleton_hash"] = skeleton.fingerprint()
+    return arm_obj
+
+
+def _has_dependents(arm_obj):
+    """Whether any object is still parented to or deformed by this armature."""
+    for obj in bpy.data.objects:
+        if obj.parent == arm_obj:
+            return True
+        for mod in obj.modifiers:
+            if mod.type == 'ARMATURE' and mod.object == arm_obj:
+                return True
+    return False
+
+
+def submesh_material(si, submesh_count):
+    """Material for a submesh: submesh 0 is glass if there are multiple submeshes."""
+    if submesh_count > 1 and si == 0:
+        mat_name = "glass"
+        glass_mat = bpy.data.materials.get(mat_name) or bpy.data.materials.new(name=mat_name)
+        glass_mat.use_nodes = True
+        bsdf = glass_mat.node_tree.nodes.get("Principled BSDF")
+        if bsdf and "Transmission" in bsdf.inputs:
+            bsdf.inputs["Transmission"].default_value = 1.0
+        return glass_mat
+    mat_name = f"submesh_{si}"
+    return bpy.data.materials.get(mat_name) or bpy.data.materials.new(name=mat_name)
+
+
+def write_vertex_colors(mesh_data, colors):
+    """Write (V, 4) linear colors to the POINT "Col" attribute, creating it if needed."""
+    color_layer = mesh_data.color_attributes.get("Col")
+    if color_layer is not None and (color_layer.domain != 'POINT' or color_layer.data_type != 'FLOAT_COLOR'):
+        mesh_data.color_attributes.remove(color_layer)
+        color_layer = None
+    if color_layer is None:
         color_layer = mesh_data.color_attributes.new(name="Col", type='FLOAT_COLOR', domain='POINT')
+    color_layer.data.foreach_set("color", np.ascontiguousarray(colors, dtype=np.float32).ravel())
 
-    for i, v in enumerate(all_vertices):
-        color_layer.data[i].color = v['color']
-
-    print("[AnimImporter] 🎨 Vertex colors applied")
-
-    # --- Vertex groups & weights ---
-    for idx, b in enumerate(bones):
-        mesh_obj.vertex_groups.new(name=b['name'])
-
-    for v_idx, v in enumerate(all_vertices):
-        b1, b2 = v['bones']
-        w1, w2 = v['weights']
-        if 0 <= b1 < len(bones) and w1 > 0:
-            mesh_obj.vertex_groups[bones[b1]['name']].add([v_idx], w1, 'REPLACE')
-        if 0 <= b2 < len(bones) and w2 > 0:
-            mesh_obj.vertex_groups[bones[b2]['name']].add([v_idx], w2, 'REPLACE')
 
-    # --- Parent mesh to armature (object parent + armature modifier) ---
+def bind_to_armature(mesh_obj, arm_obj):
+    """Parent the mesh to the armature and point its armature modifier at it."""
     mesh_obj.parent = arm_obj
     mesh_obj.parent_type = 'OBJECT'
-    mod = mesh_obj.modifiers.new("ArmatureMod", 'ARMATURE')
+    mod = next((m for m in mesh_obj.modifiers if m.type == 'ARMATURE'), None)
+    if mod is None:
+        mod = mesh_obj.modifiers.new("ArmatureMod", 'ARMATURE')
     mod.object = arm_obj
 
-    # --- Store metadata on the mesh object for export ---
+
+def store_anim_metadata(mesh_obj, arrays, anim_path):
+    """Store the file-level data the exporter needs as custom props."""
     mesh_obj["anim_source_path"] = anim_path
-    mesh_obj["anim_file_unknown"] = file_unknown
-    mesh_obj["anim_submesh_count"] = submesh_count
+    mesh_obj["anim_file_unknown"] = arrays.file_unknown
+    mesh_obj["anim_submesh_count"] = arrays.submesh_count
 
     # Store per-submesh unknown headers as a flat byte string in custom props
     # (Blender custom props don't support bytes directly, store as list of ints)
     flat_headers = []
-    for h in submesh_unknown_headers:
+    for h in arrays.submesh_headers:
         flat_headers.extend(list(h))
     mesh_obj["anim_submesh_headers"] = flat_headers
+    mesh_obj["anim_weights_hash"] = weights_fingerprint(arrays)
 
-    # --- Coordinate space correction ---
-    # Set transforms on armature, then apply to both armature and mesh.
-    arm_obj.scale.x = -1.0
-    arm_obj.rotation_euler.x = math.radians(-90)
-    arm_obj.rotation_euler.z = math.radians(180)
 
-    # Apply armature transform
-    context.view_layer.objects.active = arm_obj
-    bpy.ops.object.select_all(action='DESELECT')
-    arm_obj.select_set(True)
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+def weights_fingerprint(arrays):
+    """Hash of the skin weights and the bone names they refer to.
 
-    # Apply mesh transform
-    context.view_layer.objects.active = mesh_obj
-    bpy.ops.object.select_all(action='DESELECT')
-    mesh_obj.select_set(True)
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+    Vertex group weights can't be read back in bulk, so reimport compares
+    this against the value stored at the last import instead."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(arrays.skeleton.names).encode('utf-8'))
+    digest.update(np.ascontiguousarray(arrays.vertex_bones).tobytes())
+    digest.update(np.ascontiguousarray(arrays.vertex_weights).tobytes())
+    return digest.hexdigest()
 
-    # Flip normals on the mesh data (SW winding is opposite Blender)
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.mesh.flip_normals()
-    bpy.ops.object.mode_set(mode='OBJECT')
 
-    # Restore active to armature
-    context.view_layer.objects.active = arm_obj
-    arm_obj.select_set(True)
+def create_anim_objects(arrays, anim_path, context):
+    """Build the mesh for decoded AnimMeshArrays and bind it to an armature.
 
-    print("[AnimImporter] 🎉 Import complete!")
+    An armature already in the scene with the same skeleton fingerprint is
+    reused; otherwise a new one is built."""
+    t_start = time.perf_counter()
+    skeleton = arrays.skeleton
+    submesh_count = arrays.submesh_count
+    base_name = os.path.splitext(os.path.basename(anim_path))[0]
+
+    # --- Cleanup old data ---
+    for datablock in (bpy.data.objects, bpy.data.meshes, bpy.data.armatures):
+        if base_name in datablock:
+            datablock.remove(datablock[base_name])
+
+    # Armatures may be shared between imports: the old one for this file is
+    # only removed when no other mesh still depends on it.
+    arm_obj = find_shared_armature(context, skeleton.fingerprint())
+    old_arm_obj = bpy.data.objects.get(f"{base_name}_ArmatureObj")
+    if old_arm_obj is not None and old_arm_obj != arm_obj and not _has_dependents(old_arm_obj):
+        bpy.data.objects.remove(old_arm_obj)
+    old_arm_data = bpy.data.armatures.get(f"{base_name}_Armature")
+    if old_arm_data is not None and old_arm_data.users == 0:
+        bpy.data.armatures.remove(old_arm_data)
+
+    # --- Armature ---
+    if arm_obj is not None:
+        print(f"[AnimImporter] ♻️ Reusing armature {arm_obj.name}")
+    else:
+        arm_obj = build_armature(skeleton, base_name, context)
+        print("[AnimImporter] ✅ Armature created")
+    t_armature = time.perf_counter()
+
+    # --- Create Mesh ---
+    mesh_data = bpy.data.meshes.new(base_name)
+    mesh_obj = bpy.data.objects.new(base_name, mesh_data)
+    context.collection.objects.link(mesh_obj)
+
+    build_mesh(mesh_data, arrays.positions, arrays.triangles, arrays.material_indices)
+    print("[AnimImporter] ✅ Mesh created")
+    t_mesh = time.perf_counter()
+
+    # --- Materials per submesh ---
+    for si in range(submesh_count):
+        mesh_data.materials.append(submesh_material(si, submesh_count))
+
+    # --- Vertex colors ---
+    write_vertex_colors(mesh_data, arrays.colors)
+    print("[AnimImporter] 🎨 Vertex colors applied")
+
+    # --- Vertex groups & weights ---
+    for name in skeleton.names:
+        mesh_obj.vertex_groups.new(name=name)
+
+    assign_vertex_weights(mesh_obj, skeleton.names, arrays.vertex_bones, arrays.vertex_weights)
+
+    t_attributes = time.perf_counter()
+
+    # --- Parent mesh to armature (object parent + armature modifier) ---
+    bind_to_armature(mesh_obj, arm_obj)
+
+    # --- Store metadata on the mesh object for export ---
+    store_anim_metadata(mesh_obj, arrays, anim_path)
+
+    t_end = time.perf_counter()
+    print(
+        f"[AnimImporter] ⏱ armature {(t_armature - t_start) * 1000:.1f} ms | "
+        f"mesh {(t_mesh - t_armature) * 1000:.1f} ms | "
+        f"colors/weights {(t_attributes - t_mesh) * 1000:.1f} ms | "
+        f"finalize {(t_end - t_attributes) * 1000:.1f} ms"
+    )
     return mesh_obj, arm_obj
 
 
+# --------------------------
+# In-place reimport
+# --------------------------
+def _same_path(a, b):
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+def is_imported_mesh(obj):
+    """True for meshes built by the importer.
+
+    "Select Source .anim" also sets anim_source_path, on meshes the user made
+    themselves; only the importer writes anim_weights_hash.
+    """
+    return (
+        obj is not None and obj.type == 'MESH'
+        and bool(obj.get("anim_source_path")) and "anim_weights_hash" in obj
+    )
+
+
+def find_imported_meshes(anim_path):
+    """Meshes imported from `anim_path` (not ones merely linked to it)."""
+    return [
+        obj for obj in bpy.data.objects
+        if is_imported_mesh(obj) and _same_path(obj["anim_source_path"], anim_path)
+    ]
+
+
+def _has_triangle_topology(mesh_data, triangles):
+    """Whether the mesh has exactly the triangle polygons `triangles` describes."""
+    num_tris = len(triangles)
+    if len(mesh_data.polygons) != num_tris or len(mesh_data.loops) != num_tris * 3:
+        return False
+    loop_totals = np.empty(num_tris, dtype=np.int32)
+    mesh_data.polygons.foreach_get("loop_total", loop_totals)
+    if not np.all(loop_totals == 3):
+        return False
+    loop_starts = np.empty(num_tris, dtype=np.int32)
+    mesh_data.polygons.foreach_get("loop_start", loop_starts)
+    if not np.array_equal(loop_starts, np.arange(0, num_tris * 3, 3, dtype=np.int32)):
+        return False
+    vertex_indices = np.empty(num_tris * 3, dtype=np.int32)
+    mesh_data.loops.foreach_get("vertex_index", vertex_indices)
+    return np.array_equal(vertex_indices, np.ascontiguousarray(triangles, dtype=np.int32).ravel())
+
+
+def _update_buffer(collection, attr, values, dtype):
+    """foreach_set `values` unless the collection already holds them. Returns True if written."""
+    values = np.ascontiguousarray(values, dtype=dtype).ravel()
+    current = np.empty(len(values), dtype=dtype)
+    collection.foreach_get(attr, current)
+    if np.array_equal(current, values):
+        return False
+    collection.foreach_set(attr, values)
+    return True
+
+
+def _update_vertex_colors(mesh_data, colors):
+    color_layer = mesh_data.color_attributes.get("Col")
+    if (color_layer is not None and color_layer.domain == 'POINT'
+            and color_layer.data_type == 'FLOAT_COLOR' and len(color_layer.data) == len(colors)):
+        return _update_buffer(color_layer.data, "color", colors, np.float32)
+    write_vertex_colors(mesh_data, colors)
+    return True
+
+
+def _rewrite_vertex_weights(mesh_obj, arrays):
+    """Replace the skin weights, leaving vertex groups that aren't bones alone."""
+    names = arrays.skeleton.names
+    all_vertices = list(range(len(mesh_obj.data.vertices)))
+    for name in names:
+        group = mesh_obj.vertex_groups.get(name)
+        if group is None:
+            mesh_obj.vertex_groups.new(name=name)
+        else:
+            group.remove(all_vertices)
+    assign_vertex_weights(mesh_obj, names, arrays.vertex_bones, arrays.vertex_weights)
+
+
+def refresh_anim_objects(arrays, mesh_obj, anim_path, context):
+    """Update a previously imported mesh in place from freshly decoded arrays.
+
+    Only the buffers that differ are rewritten. The mesh datablock, its
+    modifiers, materials and collection links are kept; geometry is only
+    rebuilt (into the same datablock) when the triangle list changed. The
+    armature is left untouched when the skeleton fingerprint still matches.
+    Returns (mesh_obj, arm_obj, names of the updated buffers).
+    """
+    t_start = time.perf_counter()
+    skeleton = arrays.skeleton
+    mesh_data = mesh_obj.data
+    updated = []
+
+    # --- Geometry ---
+    if (len(mesh_data.vertices) == len(arrays.positions)
+            and _has_triangle_topology(mesh_data, arrays.triangles)):
+        if _update_buffer(mesh_data.vertices, "co", arrays.positions, np.float32):
+            updated.append("positions")
+        if _update_buffer(mesh_data.polygons, "material_index", arrays.material_indices, np.int32):
+            updated.append("materials")
+        rebuilt = False
+    else:
+        mesh_data.clear_geometry()
+        build_mesh(mesh_data, arrays.positions, arrays.triangles, arrays.material_indices)
+        updated.append("geometry")
+        rebuilt = True
+
+    # Keep user materials; only add slots for submeshes that are new
+    for si in range(len(mesh_data.materials), arrays.submesh_count):
+        mesh_data.materials.append(submesh_material(si, arrays.submesh_count))
+
+    # --- Colors ---
+    if _update_vertex_colors(mesh_data, arrays.colors):
+        updated.append("colors")
+
+    if "positions" in updated:
+        mesh_data.update()
+    t_mesh = time.perf_counter()
+
+    # --- Skeleton ---
+    fingerprint = skeleton.fingerprint()
+    old_arm_obj = mesh_obj.parent if mesh_obj.parent is not None and mesh_obj.parent.type == 'ARMATURE' else None
+    arm_obj = old_arm_obj
+    if arm_obj is None or arm_obj.get("anim_skeleton_hash") != fingerprint:
+        arm_obj = find_shared_armature(context, fingerprint)
+        if arm_obj is None:
+            base_name = os.path.splitext(os.path.basename(anim_path))[0]
+            arm_obj = build_armature(skeleton, base_name, context)
+        bind_to_armature(mesh_obj, arm_obj)
+        if old_arm_obj is not None and not _has_dependents(old_arm_obj):
+            old_arm_data = old_arm_obj.data
+            bpy.data.objects.remove(old_arm_obj)
+            if old_arm_data.users == 0:
+                bpy.data.armatures.remove(old_arm_data)
+        updated.append("skeleton")
+    t_armature = time.perf_counter()
+
+    # --- Weights ---
+    # Rebuilt geometry starts without any weights
+    if rebuilt or mesh_obj.get("anim_weights_hash") != weights_fingerprint(arrays):
+        _rewrite_vertex_weights(mesh_obj, arrays)
+        updated.append("weights")
+
+    store_anim_metadata(mesh_obj, arrays, anim_path)
+
+    t_end = time.perf_counter()
+    print(
+        f"[AnimImporter] ♻️ Refreshed {mesh_obj.name}: {', '.join(updated) or 'nothing changed'} | "
+        f"mesh {(t_mesh - t_start) * 1000:.1f} ms | "
+        f"armature {(t_armature - t_mesh) * 1000:.1f} ms | "
+        f"weights {(t_end - t_armature) * 1000:.1f} ms"
+    )
+    return mesh_obj, arm_obj, updated
+
+
+def reimport_anim(anim_path, context):
+    """Refresh every mesh imported from `anim_path` in place.
+
+    Falls back to a regular import when nothing in the file links to it.
+    Returns a list of (mesh_obj, arm_obj, updated buffer names)."""
+    targets = find_imported_meshes(anim_path)
+    if not targets:
+        mesh_obj, arm_obj = import_anim(anim_path, context)
+        return [(mesh_obj, arm_obj, ["geometry", "skeleton", "weights"])]
+
+    t_start = time.perf_counter()
+    arrays = load_mesh_arrays(anim_path, context)
+    t_parsed = time.perf_counter()
+    results = [refresh_anim_objects(arrays, mesh_obj, anim_path, context) for mesh_obj in targets]
+    print(f"[AnimImporter] ⏱ parse {(t_parsed - t_start) * 1000:.1f} ms | "
+          f"total {(time.perf_counter() - t_start) * 1000:.1f} ms")
+    return results
+
+
 # --------------------------
 # Operator
 # --------------------------
@@ -343,10 +517,71 @@ class ANIMIO_OT_import(bpy.types.Operator, ImportHelper):
     filename_ext = ".anim"
     filter_glob: StringProperty(default="*.anim", options={'HIDDEN'})
 
+    # Multi-select support: the file browser fills these in
+    files: CollectionProperty(type=bpy.types.OperatorFileListElement, options={'HIDDEN', 'SKIP_SAVE'})
+    directory: StringProperty(subtype='DIR_PATH', options={'HIDDEN', 'SKIP_SAVE'})
+
+    import_whole_folder: BoolProperty(
+        name="Import Whole Folder",
+        description="Import every .anim file in the current folder instead of only the selected files",
+        default=False
+    )
+
+    update_existing: BoolProperty(
+        name="Update Existing Objects",
+        description="Refresh meshes previously imported from the same file in place, "
+                    "keeping their modifiers and materials, instead of recreating them",
+        default=False
+    )
+
+    def _selected_paths(self):
+        directory = self.directory or os.path.dirname(self.filepath)
+        if self.import_whole_folder:
+            return [
+                os.path.join(directory, name)
+                for name in sorted(os.listdir(directory))
+                if name.lower().endswith(".anim")
+            ]
+        names = [f.name for f in self.files if f.name]
+        if names:
+            return [os.path.join(directory, name) for name in names]
+        return [self.filepath]
+
     def execute(self, context):
         try:
-            mesh_obj, arm_obj = import_anim(self.filepath, context)
-            self.report({'INFO'}, f"Imported: {os.path.basename(self.filepath)}")
+            paths = self._selected_paths()
+        except Exception as e:
+            self.report({'ERROR'}, f"Could not list .anim files: {e}")
+            import traceback
+            traceback.print_exc()
+            return {'CANCELLED'}
+        if not paths:
+            self.report({'ERROR'}, "No .anim files found.")
+            return {'CANCELLED'}
+
+        if len(paths) > 1:
+            try:
+                imported, failed = import_anim_batch(paths, context, self.update_existing)
+            except Exception as e:
+                self.report({'ERROR'}, f"Import failed: {e}")
+                import traceback
+                traceback.print_exc()
+                return {'CANCELLED'}
+            if not imported:
+                self.report({'ERROR'}, f"Import failed for all {len(failed)} files (see console).")
+                return {'CANCELLED'}
+            if failed:
+                self.report({'WARNING'}, f"Imported {len(imported)} files, {len(failed)} failed (see console).")
+            else:
+                self.report({'INFO'}, f"Imported {len(imported)} files.")
+            return {'FINISHED'}
+
+        try:
+            if self.update_existing:
+                reimport_anim(paths[0], context)
+            else:
+                import_anim(paths[0], context)
+            self.report({'INFO'}, f"Imported: {os.path.basename(paths[0])}")
         except Exception as e:
             self.report({'ERROR'}, f"Import failed: {e}")
             import traceback
@@ -355,10 +590,45 @@ class ANIMIO_OT_import(bpy.types.Operator, ImportHelper):
         return {'FINISHED'}
 
 
+class ANIMIO_OT_reload(bpy.types.Operator):
+    bl_idname = "animio.reload_anim"
+    bl_label = "Reload .anim"
+    bl_description = "Update the active object in place from its source .anim file, rewriting only what changed"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        if is_imported_mesh(context.active_object):
+            return True
+        cls.poll_message_set("Active object was not imported from an .anim file")
+        return False
+
+    def execute(self, context):
+        anim_path = context.active_object["anim_source_path"]
+        if not os.path.exists(anim_path):
+            self.report({'ERROR'}, f"Source .anim not found: {anim_path}")
+            return {'CANCELLED'}
+
+        try:
+            results = reimport_anim(anim_path, context)
+        except Exception as e:
+            self.report({'ERROR'}, f"Reload failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return {'CANCELLED'}
+
+        updated = sorted({name for _, _, names in results for name in names})
+        self.report({'INFO'}, f"Reloaded {os.path.basename(anim_path)}: {', '.join(updated) or 'no changes'}")
+        return {'FINISHED'}
+
+
 # --------------------------
 # Registration
 # --------------------------
-classes = (ANIMIO_OT_import,)
+classes = (
+    ANIMIO_OT_import,
+    ANIMIO_OT_reload,
+)
 
 
 def register():
@@ -59,6 +59,10 @@ class VIEW3D_PT_anim_io(bpy.types.Panel):
                 export_box.label(text=f"Source: {os.path.basename(source)}", icon='FILE_TICK')
                 row = export_box.row()
                 row.operator("animio.export_anim", text="Export .anim", icon='FILE')
+                # Pull external edits of the source back in without rebuilding.
+                # Only for imported meshes: a manually linked one isn't built from the file.
+                if "anim_weights_hash" in obj:
+                    row.operator("animio.reload_anim", text="", icon='FILE_REFRESH')
                 # Small button to re-link a different source file
                 row.operator("animio.set_source", text="", icon='FILEBROWSER')
             else:
@@ -0,0 +1 @@
+"""Blender-independent readers and writers for Stormworks file formats."""
@@ -0,0 +1,633 @@
+"""
+Stormworks .anim codec, independent of Blender.
+
+The format is a small header, a list of submeshes (opaque 10-byte header,
+a section of 52-byte vertex records and a section of uint32 triangles) and
+a tail holding the bone table followed by animation data. Everything here
+works on NumPy arrays, so files can be parsed, validated, rewritten and
+benchmarked without launching Blender:
+
+    from SWToolkit.formats import anim
+
+    data = anim.read("character.anim")
+    data.submeshes[0].vertices['pos']     # (V, 3) float32, file space
+    anim.write(data, "copy.anim")         # byte-for-byte identical
+
+animImporter / animExporter are thin Blender adapters on top of this module.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+import numpy as np
+
+
+# --------------------------
+# Section layout
+# --------------------------
+FILE_HEADER_SIZE = 12       # magic + file_unknown + submesh_count
+SUBMESH_HEADER_SIZE = 10    # opaque per-submesh header, preserved verbatim
+VERTEX_SIZE = 52
+TRIANGLE_SIZE = 12
+NO_PARENT = 0xFFFFFFFF
+WRITE_BUFFER_SIZE = 1 << 20
+
+# One 52-byte .anim vertex record, laid out exactly as on disk.
+ANIM_VERTEX_DTYPE = np.dtype([
+    ('pos', '<f4', (3,)),
+    ('color', 'u1', (4,)),
+    ('uv', '<f4', (2,)),
+    ('normal', '<f4', (3,)),
+    ('bones', '<f4', (2,)),
+    ('weights', '<f4', (2,)),
+])
+
+# SW → Blender axis conversion, folded into one matrix: (x, y, z) → (-x, -z, y).
+# This is the X/Y negation followed by the object correction (scale X -1,
+# rotate X -90°, rotate Z 180°) the importer used to set and apply.
+SW_TO_BLENDER = np.array((
+    (-1.0, 0.0, 0.0),
+    (0.0, 0.0, -1.0),
+    (0.0, 1.0, 0.0),
+), dtype=np.float32)
+
+# Blender → SW, the inverse (and transpose) of SW_TO_BLENDER: (x, y, z) → (-x, z, -y).
+BLENDER_TO_SW = np.ascontiguousarray(SW_TO_BLENDER.T)
+
+
+# --------------------------
+# Helper functions
+# --------------------------
+def safe_unpack(fmt, data, offset):
+    size = struct.calcsize(fmt)
+    if offset + size > len(data):
+        return None, offset
+    return struct.unpack_from(fmt, data, offset), offset + size
+
+
+def safe_decode(data, offset, length, encoding='ascii'):
+    try:
+        return bytes(data[offset:offset + length]).decode(encoding)
+    except UnicodeDecodeError:
+        return bytes(data[offset:offset + length]).decode('latin-1')
+
+
+def srgb_to_linear(c):
+    """Convert sRGB channels (0.0–1.0, scalar or array) to linear light.
+    The .anim file stores raw sRGB bytes; Blender FLOAT_COLOR attributes are
+    linear, so we must un-gamma on import and re-gamma on export."""
+    c = np.clip(c, 0.0, 1.0)
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(c):
+    """Convert linear light channels (0.0–1.0, scalar or array) to sRGB bytes (0–255)."""
+    c = np.clip(c, 0.0, 1.0)
+    srgb = np.where(c <= 0.0031308, c * 12.92, 1.055 * (c ** (1.0 / 2.4)) - 0.055)
+    return (srgb * 255 + 0.5).astype(np.uint8)
+
+
+# --------------------------
+# Data model
+# --------------------------
+class AnimSubmesh:
+    """
+    One submesh in file space.
+
+    vertices:  (V,) ANIM_VERTEX_DTYPE structured array
+    triangles: (F, 3) uint32 submesh-local vertex indices
+    Bytes after the last whole record of a section are kept in *_extra so
+    unusual files still round-trip exactly.
+    """
+    __slots__ = ('header', 'vertices', 'triangles', 'vertex_extra', 'triangle_extra')
+
+    def __init__(self, header, vertices, triangles, vertex_extra=b'', triangle_extra=b''):
+        self.header = bytes(header)
+        self.vertices = vertices
+        self.triangles = triangles
+        self.vertex_extra = vertex_extra
+        self.triangle_extra = triangle_extra
+
+
+class AnimSkeleton:
+    """
+    The bone table at the start of the tail, array-backed.
+
+    names:     list of bone names
+    matrices:  (B, 12) float32 bone matrices; [9:12] is the head offset
+    parents:   (B,) uint32 parent index, NO_PARENT for roots
+    children:  list of child index lists
+    size:      byte length of the table inside the tail
+    """
+    __slots__ = ('names', 'matrices', 'parents', 'children', 'size')
+
+    def __init__(self, names, matrices, parents, children, size):
+        self.names = names
+        self.matrices = matrices
+        self.parents = parents
+        self.children = children
+        self.size = size
+
+    def __len__(self):
+        return len(self.names)
+
+    def fingerprint(self):
+        """Hash of the bone table (names, matrices, hierarchy).
+
+        Files whose skeletons share a fingerprint can share one armature."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update("\0".join(self.names).encode('utf-8'))
+        digest.update(np.ascontiguousarray(self.matrices, dtype='<f4').tobytes())
+        digest.update(np.ascontiguousarray(self.parents, dtype='<u4').tobytes())
+        for bone_children in self.children:
+            digest.update(np.array([len(bone_children), *bone_children], dtype='<u4').tobytes())
+        return digest.hexdigest()
+
+
+class AnimData:
+    """
+    A whole .anim file.
+
+    The tail (bone table + animation data) is kept verbatim; `skeleton`
+    parses its bone table on first access.
+    """
+    __slots__ = ('file_unknown', 'submeshes', 'tail', '_skeleton')
+
+    def __init__(self, file_unknown, submeshes, tail):
+        self.file_unknown = file_unknown
+        self.submeshes = submeshes
+        self.tail = tail
+        self._skeleton = None
+
+    @property
+    def skeleton(self):
+        if self._skeleton is None:
+            self._skeleton = read_skeleton(self.tail)
+        return self._skeleton
+
+
+class AnimMeshArrays:
+    """
+    Everything the Blender importer needs, as flat arrays in Blender space.
+
+    Submeshes are concatenated: triangle indices are global, winding is
+    reversed for the mirrored axes, and material_indices holds each
+    triangle's submesh index.
+    """
+    __slots__ = (
+        'file_unknown', 'submesh_headers', 'skeleton',
+        'positions', 'triangles', 'material_indices',
+        'colors', 'vertex_bones', 'vertex_weights',
+    )
+
+    def __init__(self, file_unknown, submesh_headers, skeleton, positions, triangles,
+                 material_indices, colors, vertex_bones, vertex_weights):
+        self.file_unknown = file_unknown
+        self.submesh_headers = submesh_headers
+        self.skeleton = skeleton
+        self.positions = positions
+        self.triangles = triangles
+        self.material_indices = material_indices
+        self.colors = colors
+        self.vertex_bones = vertex_bones
+        self.vertex_weights = vertex_weights
+
+    @property
+    def submesh_count(self):
+        return len(self.submesh_headers)
+
+
+# --------------------------
+# Memory-mapped reader
+# --------------------------
+class AnimSubmeshLayout:
+    """Absolute byte offsets of one submesh's sections inside an .anim file."""
+    __slots__ = (
+        'header_offset',
+        'vertex_offset', 'vertex_size',
+        'triangle_offset', 'triangle_size',
+    )
+
+    def __init__(self, header_offset, vertex_offset, vertex_size, triangle_offset, triangle_size):
+        self.header_offset = header_offset
+        self.vertex_offset = vertex_offset
+        self.vertex_size = vertex_size
+        self.triangle_offset = triangle_offset
+        self.triangle_size = triangle_size
+
+    @property
+    def end_offset(self):
+        return self.triangle_offset + self.triangle_size
+
+
+class AnimFile:
+    """
+    Read-only, memory-mapped view of an .anim file.
+
+    Opening the file walks the submesh table once and records where every
+    section starts; the sections themselves are handed out as memoryview
+    slices of the mapping, so nothing is copied until a caller asks for it.
+
+        with AnimFile(path) as anim:
+            verts = anim.vertex_section(0)   # memoryview, zero-copy
+            tail = anim.tail()               # bones + animation data
+
+    Arrays created from these views (e.g. with numpy.frombuffer) keep the
+    mapping alive; it is released once they are garbage collected.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            if self._file.seek(0, 2) < FILE_HEADER_SIZE:
+                raise ValueError("Not a valid .anim file")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.buffer = memoryview(self._mmap)
+            self._build_index()
+        except Exception:
+            self.close()
+            raise
+
+    def _build_index(self):
+        data = self.buffer
+        if data[:4] != b'anim':
+            raise ValueError("Not a valid .anim file")
+        self.file_unknown, self.submesh_count = struct.unpack_from("<II", data, 4)
+
+        offset = FILE_HEADER_SIZE
+        self.submeshes = []
+        for si in range(self.submesh_count):
+            header_offset = offset
+            offset += SUBMESH_HEADER_SIZE
+            vertex_size = self._section_size(offset, si)
+            vertex_offset = offset + 4
+            offset = vertex_offset + vertex_size
+            triangle_size = self._section_size(offset, si)
+            triangle_offset = offset + 4
+            offset = triangle_offset + triangle_size
+            if offset > len(data):
+                raise ValueError(f"Truncated .anim file: submesh {si} runs past the end of the file")
+            self.submeshes.append(AnimSubmeshLayout(
+                header_offset, vertex_offset, vertex_size, triangle_offset, triangle_size,
+            ))
+        self.tail_offset = offset
+
+    def _section_size(self, offset, si):
+        if offset + 4 > len(self.buffer):
+            raise ValueError(f"Truncated .anim file: submesh {si} runs past the end of the file")
+        return struct.unpack_from("<I", self.buffer, offset)[0]
+
+    # --- Section views ---
+    def submesh_header(self, si):
+        """The opaque 10-byte header of submesh `si`."""
+        start = self.submeshes[si].header_offset
+        return self.buffer[start:start + SUBMESH_HEADER_SIZE]
+
+    def vertex_section(self, si):
+        layout = self.submeshes[si]
+        return self.buffer[layout.vertex_offset:layout.vertex_offset + layout.vertex_size]
+
+    def triangle_section(self, si):
+        layout = self.submeshes[si]
+        return self.buffer[layout.triangle_offset:layout.triangle_offset + layout.triangle_size]
+
+    def tail(self):
+        """Everything after the last submesh (bones + animation data)."""
+        return self.buffer[self.tail_offset:]
+
+    # --- Lifetime ---
+    def close(self):
+        buffer = getattr(self, 'buffer', None)
+        mapping = getattr(self, '_mmap', None)
+        try:
+            if buffer is not None:
+                buffer.release()
+            if mapping is not None:
+                mapping.close()
+        except BufferError:
+            # Arrays still view the mapping; it is unmapped when they are collected.
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# --------------------------
+# Decoding
+# --------------------------
+def decode_vertices(section):
+    """View a vertex section as a structured array (no per-vertex parsing).
+    Trailing bytes that do not form a whole record are ignored."""
+    return np.frombuffer(section, dtype=ANIM_VERTEX_DTYPE, count=len(section) // VERTEX_SIZE)
+
+
+def decode_triangles(section):
+    """View a triangle section as an (N, 3) uint32 index array."""
+    count = (len(section) // TRIANGLE_SIZE) * 3
+    return np.frombuffer(section, dtype='<u4', count=count).reshape(-1, 3)
+
+
+def read_skeleton(tail):
+    """Parse the bone table at the start of the skeleton/animation tail."""
+    offset = 0
+    res, offset = safe_unpack("<I", tail, offset)
+    total_bones = res[0] if res else 0
+
+    names = []
+    matrices = np.zeros((total_bones, 12), dtype=np.float32)
+    parents = np.full(total_bones, NO_PARENT, dtype=np.uint32)
+    children = []
+
+    for bi in range(total_bones):
+        res, offset = safe_unpack("<H", tail, offset)
+        name_len = res[0]
+        names.append(safe_decode(tail, offset, name_len))
+        offset += name_len
+        res, offset = safe_unpack("<12f", tail, offset)
+        matrices[bi] = res
+        res, offset = safe_unpack("<I", tail, offset)
+        parents[bi] = res[0]
+        res, offset = safe_unpack("<I", tail, offset)
+        child_count = res[0]
+        bone_children = []
+        for _ in range(child_count):
+            res, offset = safe_unpack("<I", tail, offset)
+            bone_children.append(res[0])
+        children.append(bone_children)
+
+    return AnimSkeleton(names, matrices, parents, children, offset)
+
+
+def _decode(anim, copy):
+    """Build an AnimData from an open AnimFile, copying the sections or viewing them."""
+    submeshes = []
+    for si in range(anim.submesh_count):
+        vertex_section = anim.vertex_section(si)
+        triangle_section = anim.triangle_section(si)
+        vertices = decode_vertices(vertex_section)
+        triangles = decode_triangles(triangle_section)
+        vertex_extra = vertex_section[vertices.nbytes:]
+        triangle_extra = triangle_section[triangles.nbytes:]
+        if copy:
+            vertices, triangles = vertices.copy(), triangles.copy()
+            vertex_extra, triangle_extra = bytes(vertex_extra), bytes(triangle_extra)
+        submeshes.append(AnimSubmesh(anim.submesh_header(si), vertices, triangles, vertex_extra, triangle_extra))
+
+    tail = bytes(anim.tail()) if copy else anim.tail()
+    return AnimData(anim.file_unknown, submeshes, tail)
+
+
+def read(path):
+    """Parse an .anim file into an AnimData that owns its arrays."""
+    with AnimFile(path) as anim:
+        return _decode(anim, copy=True)
+
+
+def read_mesh_arrays(path):
+    """Decode an .anim file straight into AnimMeshArrays.
+
+    The raw records are read through the file mapping and never copied; the
+    only allocation is the Blender-space output."""
+    with AnimFile(path) as anim:
+        return to_mesh_arrays(_decode(anim, copy=False))
+
+
+# --------------------------
+# Source layouts
+# --------------------------
+SOURCE_CACHE_SIZE = 8
+
+
+class AnimSource:
+    """
+    What re-exporting against a source .anim needs from it: the file-level
+    unknown, the per-submesh headers, the bone names and the skeleton/animation
+    tail.
+
+    Built in one pass over a mapped AnimFile. The tail is copied out once and
+    the mapping is closed straight away, so the source can be overwritten
+    (including by exporting onto it) while the layout stays cached; `tail`
+    hands out zero-copy views of that copy.
+    """
+
+    __slots__ = ('file_unknown', 'submesh_headers', 'tail_offset', 'bone_names', '_tail')
+
+    def __init__(self, path):
+        with AnimFile(path) as anim_file:
+            self.file_unknown = anim_file.file_unknown
+            self.submesh_headers = [bytes(anim_file.submesh_header(si)) for si in range(anim_file.submesh_count)]
+            self.tail_offset = anim_file.tail_offset
+            self._tail = bytes(anim_file.tail())
+        self.bone_names = read_skeleton(self._tail).names
+
+    @property
+    def submesh_count(self):
+        return len(self.submesh_headers)
+
+    @property
+    def tail(self):
+        """Zero-copy view of the skeleton/animation tail."""
+        return memoryview(self._tail)
+
+
+_source_cache = OrderedDict()
+
+
+def load_source(path):
+    """
+    AnimSource for `path`, cached per process.
+
+    Entries are keyed by absolute path and reused while the file's size and
+    mtime are unchanged, so repeated exports against the same source skip
+    parsing it. The least recently used entries are dropped past
+    SOURCE_CACHE_SIZE.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+
+    entry = _source_cache.get(path)
+    if entry is not None and entry[0] == stamp:
+        _source_cache.move_to_end(path)
+        return entry[1]
+
+    source = AnimSource(path)
+    _source_cache[path] = (stamp, source)
+    _source_cache.move_to_end(path)
+    while len(_source_cache) > SOURCE_CACHE_SIZE:
+        _source_cache.popitem(last=False)
+    return source
+
+
+def clear_source_cache():
+    _source_cache.clear()
+
+
+# --------------------------
+# Encoding
+# --------------------------
+def _section_layout(anim):
+    """Contiguous arrays and section sizes of every submesh, checked against
+    the format's uint32 size fields before anything is written."""
+    layout = []
+    for si, sm in enumerate(anim.submeshes):
+        if len(sm.header) != SUBMESH_HEADER_SIZE:
+            raise ValueError(f"Submesh {si} header is {len(sm.header)} bytes, expected {SUBMESH_HEADER_SIZE}")
+        vertices = np.ascontiguousarray(sm.vertices, dtype=ANIM_VERTEX_DTYPE)
+        triangles = np.ascontiguousarray(sm.triangles, dtype='<u4')
+        vertex_size = vertices.nbytes + len(sm.vertex_extra)
+        triangle_size = triangles.nbytes + len(sm.triangle_extra)
+        if max(vertex_size, triangle_size) > 0xFFFFFFFF:
+            raise ValueError(f"Submesh {si} is too large for the .anim format")
+        layout.append((sm, vertices, vertex_size, triangles, triangle_size))
+    return layout
+
+
+def _read_umask():
+    # os.umask can only be read by setting it; done once at import, before
+    # any other thread could be creating files.
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# Mode for newly created .anim files, as open() would give them
+DEFAULT_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def _new_file_mode(path):
+    """Permissions for a rewritten file: the existing file's, or the umask default."""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        return DEFAULT_FILE_MODE
+
+
+def write(anim, path):
+    """
+    Write an AnimData to `path`, one section at a time.
+
+    Section sizes are computed up front, then the header, submesh sections
+    and tail are streamed through a buffered writer into a temporary file
+    next to `path`, which atomically replaces it once complete. A failed or
+    interrupted export never leaves a partial .anim behind.
+    """
+    layout = _section_layout(anim)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".anim.tmp")
+    try:
+        with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(struct.pack("<4sII", b'anim', anim.file_unknown, len(layout)))
+            for sm, vertices, vertex_size, triangles, triangle_size in layout:
+                f.write(sm.header)
+                f.write(struct.pack("<I", vertex_size))
+                f.write(vertices)
+                f.write(sm.vertex_extra)
+                f.write(struct.pack("<I", triangle_size))
+                f.write(triangles)
+                f.write(sm.triangle_extra)
+            f.write(anim.tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _new_file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# --------------------------
+# Blender-space conversion (pure NumPy)
+# --------------------------
+def to_mesh_arrays(anim):
+    """
+    Convert an AnimData into concatenated, Blender-space AnimMeshArrays.
+
+    Output arrays are allocated once and filled submesh by submesh, so the
+    raw records are never concatenated.
+    """
+    vertex_counts = [len(sm.vertices) for sm in anim.submeshes]
+    face_counts = [len(sm.triangles) for sm in anim.submeshes]
+    num_verts = sum(vertex_counts)
+    num_faces = sum(face_counts)
+
+    positions = np.empty((num_verts, 3), dtype=np.float32)
+    colors = np.empty((num_verts, 4), dtype=np.float32)
+    vertex_bones = np.empty((num_verts, 2), dtype=np.int32)
+    vertex_weights = np.empty((num_verts, 2), dtype=np.float32)
+    triangles = np.empty((num_faces, 3), dtype=np.int32)
+
+    v_start = f_start = 0
+    for sm, v_count, f_count in zip(anim.submeshes, vertex_counts, face_counts):
+        v_end, f_end = v_start + v_count, f_start + f_count
+        records = sm.vertices
+
+        positions[v_start:v_end] = records['pos'] @ SW_TO_BLENDER.T
+        colors[v_start:v_end, :3] = srgb_to_linear(records['color'][:, :3] / 255.0)
+        colors[v_start:v_end, 3] = records['color'][:, 3] / 255.0  # alpha is not gamma-corrected
+        vertex_bones[v_start:v_end] = records['bones']  # float → int truncates like int()
+        vertex_weights[v_start:v_end] = records['weights']
+
+        # The axis conversion mirrors the mesh, so reverse the winding to keep
+        # normals facing outwards (SW winding is opposite Blender).
+        triangles[f_start:f_end] = sm.triangles[:, (0, 2, 1)].astype(np.int32) + v_start
+
+        v_start, f_start = v_end, f_end
+
+    material_indices = np.repeat(np.arange(len(anim.submeshes), dtype=np.int32), face_counts)
+
+    return AnimMeshArrays(
+        anim.file_unknown,
+        [sm.header for sm in anim.submeshes],
+        anim.skeleton,
+        positions, triangles, material_indices,
+        colors, vertex_bones, vertex_weights,
+    )
+
+
+def bone_heads_tails(skeleton):
+    """
+    Blender-space bone heads and tails, as (B, 3) float32 arrays.
+
+    Heads accumulate each bone's local offset onto its parent's head, one
+    hierarchy level per vectorized step. Tails sit at the mean of the
+    children's heads, or 0.05 along -Y for leaf bones.
+    """
+    count = len(skeleton)
+    local = skeleton.matrices[:, 9:12] @ SW_TO_BLENDER.T
+    parents = skeleton.parents.astype(np.int64)
+    is_root = parents == NO_PARENT
+    if np.any(~is_root & (parents >= count)):
+        raise ValueError("Bone parent index out of range")
+    parents = np.where(is_root, np.arange(count), parents)
+
+    heads = np.zeros((count, 3), dtype=np.float32)
+    heads[is_root] = local[is_root]
+    resolved = is_root.copy()
+    while not resolved.all():
+        ready = ~resolved & resolved[parents]
+        if not ready.any():
+            raise ValueError("Bone hierarchy contains a cycle")
+        idx = np.flatnonzero(ready)
+        heads[idx] = heads[parents[idx]] + local[idx]
+        resolved[idx] = True
+
+    child_counts = np.array([len(c) for c in skeleton.children], dtype=np.int64)
+    child_indices = np.array([i for c in skeleton.children for i in c], dtype=np.int64)
+    sums = np.zeros((count, 3), dtype=np.float64)
+    np.add.at(sums, np.repeat(np.arange(count), child_counts), heads[child_indices])
+
+    tails = heads + np.array((0.0, -0.05, 0.0), dtype=np.float32)
+    has_children = child_counts > 0
+    tails[has_children] = sums[has_children] / child_counts[has_children, None]
+    return heads, tails
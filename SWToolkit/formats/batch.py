@@ -0,0 +1,60 @@
+"""
+Parallel decoding of many .anim files.
+
+Decoding is pure NumPy (formats.anim), so it runs in a pool of worker
+processes; callers receive results as they complete and can build Blender
+datablocks on the main thread while the remaining files are still decoding.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from .cache import read_mesh_arrays_cached
+
+
+def _decode_serial(paths, cache):
+    for path in paths:
+        try:
+            yield path, read_mesh_arrays_cached(path, cache), None
+        except Exception as e:
+            yield path, None, e
+
+
+def decode_many(paths, cache=None, max_workers=None):
+    """
+    Decode .anim files in parallel, yielding (path, arrays, error) in
+    completion order. Exactly one of arrays / error is None.
+
+    Workers are spawned (never forked, which is unsafe inside Blender). If
+    they cannot start, the remaining files are decoded in this process.
+    """
+    paths = list(paths)
+    if max_workers is None:
+        max_workers = min(len(paths), os.cpu_count() or 1)
+    if len(paths) < 2 or max_workers < 2:
+        yield from _decode_serial(paths, cache)
+        return
+
+    finished = set()
+    try:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            futures = {pool.submit(read_mesh_arrays_cached, path, cache): path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    arrays = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    finished.add(path)
+                    yield path, None, e
+                    continue
+                finished.add(path)
+                yield path, arrays, None
+    except (BrokenProcessPool, OSError) as e:
+        # OSError: the workers could not even be launched (spawn failed)
+        print(f"[AnimBatch] Worker processes unavailable ({e}); decoding in this process")
+        yield from _decode_serial([p for p in paths if p not in finished], cache)
@@ -0,0 +1,266 @@
+"""
+Caches for decoding and encoding .anim data.
+
+AnimCache is an on-disk cache of decoded .anim files. Each entry is an
+uncompressed .npz holding the AnimMeshArrays of one file, keyed by
+(absolute path, size, mtime, content hash). A hit skips decoding entirely.
+Entry mtimes double as LRU timestamps: hits touch the entry, and the oldest
+entries are evicted once the cache grows past its size cap.
+
+SubmeshCache is an in-memory LRU of encoded submesh buffers, keyed by a
+hash of everything that went into encoding them.
+"""
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from collections import OrderedDict
+import numpy as np
+
+from .anim import AnimMeshArrays, AnimSkeleton, read_mesh_arrays
+
+
+# Bump when the cached arrays change meaning, so stale entries are never hit.
+CACHE_VERSION = 1
+ENTRY_SUFFIX = ".npz"
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def default_cache_dir():
+    return os.path.join(tempfile.gettempdir(), "SWToolkit", "anim_cache")
+
+
+def file_digest(path):
+    """blake2b content hash of a file, read in chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# --------------------------
+# AnimMeshArrays <-> npz
+# --------------------------
+def _pack(arrays):
+    skeleton = arrays.skeleton
+    child_counts = np.array([len(c) for c in skeleton.children], dtype=np.uint32)
+    child_indices = np.array([i for c in skeleton.children for i in c], dtype=np.uint32)
+    return {
+        'file_unknown': np.uint32(arrays.file_unknown),
+        'submesh_headers': np.frombuffer(b''.join(arrays.submesh_headers), dtype=np.uint8),
+        'submesh_count': np.uint32(arrays.submesh_count),
+        'positions': arrays.positions,
+        'triangles': arrays.triangles,
+        'material_indices': arrays.material_indices,
+        'colors': arrays.colors,
+        'vertex_bones': arrays.vertex_bones,
+        'vertex_weights': arrays.vertex_weights,
+        'bone_names': np.array(skeleton.names, dtype=str),
+        'bone_matrices': skeleton.matrices,
+        'bone_parents': skeleton.parents,
+        'bone_child_counts': child_counts,
+        'bone_child_indices': child_indices,
+        'skeleton_size': np.uint32(skeleton.size),
+    }
+
+
+def _unpack(entry):
+    submesh_count = int(entry['submesh_count'])
+    headers = entry['submesh_headers'].tobytes()
+    header_size = len(headers) // submesh_count if submesh_count else 0
+    child_indices = entry['bone_child_indices'].tolist()
+    children = []
+    start = 0
+    for count in entry['bone_child_counts'].tolist():
+        children.append(child_indices[start:start + count])
+        start += count
+
+    skeleton = AnimSkeleton(
+        [str(name) for name in entry['bone_names']],
+        entry['bone_matrices'],
+        entry['bone_parents'],
+        children,
+        int(entry['skeleton_size']),
+    )
+    return AnimMeshArrays(
+        int(entry['file_unknown']),
+        [headers[i * header_size:(i + 1) * header_size] for i in range(submesh_count)],
+        skeleton,
+        entry['positions'],
+        entry['triangles'],
+        entry['material_indices'],
+        entry['colors'],
+        entry['vertex_bones'],
+        entry['vertex_weights'],
+    )
+
+
+# --------------------------
+# Cache
+# --------------------------
+class AnimCache:
+    """Size-capped, LRU-evicted directory of decoded .anim files."""
+
+    def __init__(self, directory=None, max_bytes=512 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, path):
+        """Cache key for the current contents of `path`."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        ident = f"{CACHE_VERSION}|{path}|{stat.st_size}|{stat.st_mtime_ns}|{file_digest(path)}"
+        return hashlib.blake2b(ident.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def load(self, key):
+        """Return the cached AnimMeshArrays for `key`, or None on a miss."""
+        entry_path = self._entry_path(key)
+        try:
+            with np.load(entry_path, allow_pickle=False) as entry:
+                arrays = _unpack(entry)
+        except OSError:
+            return None
+        except (zipfile.BadZipFile, EOFError, KeyError, ValueError):
+            # Truncated or corrupt entry: drop it so the next store replaces it
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(entry_path)  # mark as most recently used
+        except OSError:
+            pass
+        return arrays
+
+    def store(self, key, arrays):
+        """Write an entry atomically, then evict down to the size cap."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **_pack(arrays))
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        entries = []
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        """Delete every entry."""
+        max_bytes, self.max_bytes = self.max_bytes, -1
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+
+
+class SubmeshCache:
+    """
+    Size-capped in-memory LRU of encoded (vertices, triangles) arrays.
+
+    Keys come from content_key(); hits and misses are counted so callers
+    can report how much of an export was reused.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def content_key(*parts):
+        """blake2b over arrays (shape, dtype and bytes) and plain values."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                digest.update(f"{part.dtype.str}{part.shape}".encode('ascii'))
+                digest.update(np.ascontiguousarray(part).data)
+            else:
+                digest.update(repr(part).encode('utf-8'))
+            digest.update(b'|')
+        return digest.hexdigest()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, vertices, triangles):
+        size = vertices.nbytes + triangles.nbytes
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[0].nbytes + old[1].nbytes
+        self._entries[key] = (vertices, triangles)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (old_vertices, old_triangles) = self._entries.popitem(last=False)
+            self._size -= old_vertices.nbytes + old_triangles.nbytes
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def read_mesh_arrays_cached(path, cache=None):
+    """formats.anim.read_mesh_arrays, going through `cache` when one is given.
+
+    Top-level and bpy-free so worker processes can run it."""
+    if cache is None:
+        return read_mesh_arrays(path)
+
+    key = cache.key(path)
+    arrays = cache.load(key)
+    if arrays is not None:
+        return arrays
+
+    arrays = read_mesh_arrays(path)
+    try:
+        cache.store(key, arrays)
+    except OSError as e:
+        print(f"[AnimCache] Could not write cache entry for {os.path.basename(path)}: {e}")
+    return arrays
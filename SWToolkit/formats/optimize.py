@@ -0,0 +1,178 @@
+"""
+Index buffer optimization for exported meshes, independent of Blender.
+
+Triangles are reordered for the GPU post-transform vertex cache with Tom
+Forsyth's linear-speed algorithm, then vertices are renumbered in order of
+first use so vertex fetches walk the buffer front to back. Both passes are
+deterministic (ties go to the lowest index), so the same mesh always
+produces the same bytes.
+
+Cache efficiency is reported as ACMR (cache misses per triangle, 0.5–3.0,
+lower is better) and ATVR (misses per vertex, 1.0 is optimal), measured on
+a simulated FIFO cache.
+"""
+
+from collections import deque
+import numpy as np
+
+
+VERTEX_CACHE_SIZE = 32   # simulated FIFO cache, and Forsyth's LRU size
+
+# Forsyth scoring constants, as published
+CACHE_DECAY_POWER = 1.5
+LAST_TRI_SCORE = 0.75
+VALENCE_BOOST_SCALE = 2.0
+VALENCE_BOOST_POWER = 0.5
+
+
+# --------------------------
+# Metrics
+# --------------------------
+def cache_stats(triangles, vertex_count, cache_size=VERTEX_CACHE_SIZE):
+    """(ACMR, ATVR) of an index buffer on a FIFO cache of `cache_size` entries."""
+    indices = np.asarray(triangles).ravel().tolist()
+    if not indices:
+        return 0.0, 0.0
+    fifo = deque()
+    cached = set()
+    misses = 0
+    for v in indices:
+        if v in cached:
+            continue
+        misses += 1
+        fifo.append(v)
+        cached.add(v)
+        if len(fifo) > cache_size:
+            cached.discard(fifo.popleft())
+    return misses / (len(indices) // 3), misses / max(vertex_count, 1)
+
+
+# --------------------------
+# Forsyth triangle order
+# --------------------------
+def _vertex_score(cache_pos, remaining, cache_size):
+    if remaining == 0:
+        return -1.0
+    score = 0.0
+    if cache_pos >= 0:
+        if cache_pos < 3:
+            # The three vertices of the last triangle get a fixed score, so
+            # the next triangle doesn't just hug the most recent one.
+            score = LAST_TRI_SCORE
+        else:
+            scaler = 1.0 / (cache_size - 3)
+            score = (1.0 - (cache_pos - 3) * scaler) ** CACHE_DECAY_POWER
+    return score + VALENCE_BOOST_SCALE * remaining ** -VALENCE_BOOST_POWER
+
+
+def forsyth_order(triangles, vertex_count, cache_size=VERTEX_CACHE_SIZE):
+    """Triangle order (indices into `triangles`) optimized for a vertex cache."""
+    tris = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    num_tris = len(tris)
+    if num_tris == 0:
+        return np.empty(0, dtype=np.int64)
+
+    tri_list = tris.tolist()
+    remaining = np.bincount(tris.ravel(), minlength=vertex_count).tolist()
+
+    # Per-vertex lists of triangles not emitted yet
+    vertex_tris = [[] for _ in range(vertex_count)]
+    for t, (a, b, c) in enumerate(tri_list):
+        vertex_tris[a].append(t)
+        if b != a:
+            vertex_tris[b].append(t)
+        if c != a and c != b:
+            vertex_tris[c].append(t)
+
+    cache_pos = [-1] * vertex_count
+    vertex_score = [_vertex_score(-1, r, cache_size) for r in remaining]
+    tri_score = [vertex_score[a] + vertex_score[b] + vertex_score[c] for a, b, c in tri_list]
+    emitted = [False] * num_tris
+
+    order = []
+    cache = []
+    cursor = 0
+    best = max(range(num_tris), key=tri_score.__getitem__)
+
+    while True:
+        emitted[best] = True
+        order.append(best)
+        tri = list(dict.fromkeys(tri_list[best]))  # unique, in order
+        for v in tri:
+            remaining[v] -= 1
+            vertex_tris[v].remove(best)
+
+        # Most recently used first; what falls off the end is evicted
+        new_cache = tri + [v for v in cache if v not in tri]
+        evicted = new_cache[cache_size:]
+        cache = new_cache[:cache_size]
+        for v in evicted:
+            cache_pos[v] = -1
+            vertex_score[v] = _vertex_score(-1, remaining[v], cache_size)
+        for pos, v in enumerate(cache):
+            cache_pos[v] = pos
+            vertex_score[v] = _vertex_score(pos, remaining[v], cache_size)
+
+        for v in evicted:
+            for t in vertex_tris[v]:
+                a, b, c = tri_list[t]
+                tri_score[t] = vertex_score[a] + vertex_score[b] + vertex_score[c]
+
+        # Next triangle: the best scoring one that touches the cache
+        best = -1
+        best_score = -1.0
+        for v in cache:
+            for t in vertex_tris[v]:
+                a, b, c = tri_list[t]
+                score = tri_score[t] = vertex_score[a] + vertex_score[b] + vertex_score[c]
+                if score > best_score or (score == best_score and t < best):
+                    best, best_score = t, score
+
+        if best < 0:
+            # Nothing left around the cache; continue with the next unused triangle
+            while cursor < num_tris and emitted[cursor]:
+                cursor += 1
+            if cursor == num_tris:
+                break
+            best = cursor
+
+    return np.array(order, dtype=np.int64)
+
+
+# --------------------------
+# Vertex order
+# --------------------------
+def first_use_order(triangles, vertex_count):
+    """Vertex indices in order of first reference; unreferenced ones go last."""
+    flat = np.asarray(triangles, dtype=np.int64).ravel()
+    used, first = np.unique(flat, return_index=True)
+    order = used[np.argsort(first, kind='stable')]
+    unused = np.setdiff1d(np.arange(vertex_count), used, assume_unique=True)
+    return np.concatenate((order, unused))
+
+
+def optimize_indexed(vertices, triangles, cache_size=VERTEX_CACHE_SIZE):
+    """
+    Reorder triangles for the vertex cache, then vertices by first use.
+
+    vertices: any array with one row per vertex (e.g. ANIM_VERTEX_DTYPE
+    records), triangles: (F, 3) indices into it. Returns
+    (vertices, triangles, stats) where stats holds ACMR/ATVR before and after.
+    """
+    vertex_count = len(vertices)
+    triangles = np.asarray(triangles).reshape(-1, 3)
+    acmr_before, atvr_before = cache_stats(triangles, vertex_count, cache_size)
+
+    triangles = triangles[forsyth_order(triangles, vertex_count, cache_size)]
+    vertex_order = first_use_order(triangles, vertex_count)
+    remap = np.empty(vertex_count, dtype=np.int64)
+    remap[vertex_order] = np.arange(vertex_count)
+    triangles = remap[triangles].astype(triangles.dtype)
+    vertices = vertices[vertex_order]
+
+    acmr_after, atvr_after = cache_stats(triangles, vertex_count, cache_size)
+    stats = {
+        'acmr_before': acmr_before, 'atvr_before': atvr_before,
+        'acmr_after': acmr_after, 'atvr_after': atvr_after,
+    }
+    return vertices, triangles, stats
@@ -0,0 +1,93 @@
+import bpy
+from bpy.props import BoolProperty, IntProperty, StringProperty
+from .formats.cache import AnimCache
+
+
+# --------------------------
+# Add-on preferences
+# --------------------------
+class SWToolkitPreferences(bpy.types.AddonPreferences):
+    bl_idname = __package__
+
+    use_anim_cache: BoolProperty(
+        name="Cache Decoded .anim Files",
+        description="Keep decoded .anim geometry on disk so re-importing an unchanged file skips decoding",
+        default=True
+    )
+    anim_cache_dir: StringProperty(
+        name="Cache Folder",
+        description="Where cached .anim data is stored (leave empty to use the system temp folder)",
+        subtype='DIR_PATH',
+        default=""
+    )
+    anim_cache_size_mb: IntProperty(
+        name="Cache Size Limit (MB)",
+        description="Least recently used entries are removed once the cache grows past this size",
+        default=512,
+        min=16
+    )
+
+    def draw(self, context):
+        layout = self.layout
+
+        cache_box = layout.box()
+        cache_box.label(text=".anim Import Cache", icon='FILE_CACHE')
+        cache_box.prop(self, "use_anim_cache")
+        col = cache_box.column()
+        col.enabled = self.use_anim_cache
+        col.prop(self, "anim_cache_dir")
+        col.prop(self, "anim_cache_size_mb")
+        col.operator("animio.clear_anim_cache", icon='TRASH')
+
+
+def get_preferences(context):
+    addon = context.preferences.addons.get(__package__)
+    return addon.preferences if addon else None
+
+
+def get_anim_cache(context):
+    """The configured AnimCache, or None when caching is turned off."""
+    prefs = get_preferences(context)
+    if prefs is None:
+        return AnimCache()
+    if not prefs.use_anim_cache:
+        return None
+    directory = bpy.path.abspath(prefs.anim_cache_dir) if prefs.anim_cache_dir else None
+    return AnimCache(directory, prefs.anim_cache_size_mb * 1024 * 1024)
+
+
+# --------------------------
+# Operator: clear the cache
+# --------------------------
+class ANIMIO_OT_clear_cache(bpy.types.Operator):
+    bl_idname = "animio.clear_anim_cache"
+    bl_label = "Clear .anim Cache"
+    bl_description = "Delete all cached decoded .anim files"
+
+    def execute(self, context):
+        cache = get_anim_cache(context)
+        if cache is None:
+            self.report({'WARNING'}, "The .anim cache is turned off.")
+            return {'CANCELLED'}
+        cache.clear()
+        self.report({'INFO'}, "Cleared the .anim cache.")
+        return {'FINISHED'}
+
+
+# --------------------------
+# Registration
+# --------------------------
+classes = (
+    SWToolkitPreferences,
+    ANIMIO_OT_clear_cache,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    for cls in reversed(classes):
+        bpy.utils.unregister_class(cls)
@@ -13,10 +13,270 @@ def rgb_to_hex(color):
 import bpy
 import bmesh
 import math
+import time
+import numpy as np
+
+MERGE_DISTANCE = 0.0001
+DISSOLVE_ANGLE = math.radians(5.0)  # 5 degrees, the operator default
 
 def rgb_to_hex(color):
     return ''.join(f'{int(c*255):02X}' for c in color)
-    
+
+
+def round3(values):
+    """Round float64 values to 3 decimals exactly like Python's round(x, 3).
+
+    Returns the integer thousandths. np.rint(x * 1000) only differs from
+    round() where x * 1000 lands within float error of a .5 tie, so those
+    few values are re-rounded in Python."""
+    scaled = values * 1000.0
+    q = np.rint(scaled)
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        q.flat[i] = round(round(float(values.flat[i]), 3) * 1000.0)
+    return q.astype(np.int64)
+
+
+class MeshArrays:
+    """Bulk copies of the geometry the splitter reads from the source mesh."""
+
+    def __init__(self, mesh):
+        num_polys = len(mesh.polygons)
+        self.positions = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+        mesh.vertices.foreach_get("co", self.positions.ravel())
+        self.loop_vertices = np.empty(len(mesh.loops), dtype=np.int64)
+        mesh.loops.foreach_get("vertex_index", self.loop_vertices)
+        self.loop_starts = np.empty(num_polys, dtype=np.int64)
+        self.loop_totals = np.empty(num_polys, dtype=np.int64)
+        self.material_indices = np.empty(num_polys, dtype=np.int64)
+        mesh.polygons.foreach_get("loop_start", self.loop_starts)
+        mesh.polygons.foreach_get("loop_total", self.loop_totals)
+        mesh.polygons.foreach_get("material_index", self.material_indices)
+
+    def face_loops(self, face_indices):
+        """Loop indices of the given polygons, in order, and each polygon's
+        offset into that list."""
+        totals = self.loop_totals[face_indices]
+        offsets = np.cumsum(totals) - totals
+        loops = np.repeat(self.loop_starts[face_indices] - offsets, totals) + np.arange(int(totals.sum()))
+        return loops, offsets
+
+
+def loop_colors_rgb(color_attr, loop_vertices):
+    """
+    (L, 3) float32 RGB of every face corner, from a CORNER or POINT attribute.
+
+    Byte corner colors are read as stored (sRGB byte / 255), the values the
+    BMesh color layer gave, so group keys and object names stay the same.
+    """
+    prop = "color"
+    if color_attr.domain == 'CORNER' and color_attr.data_type == 'BYTE_COLOR':
+        prop = "color_srgb"
+    colors = np.empty(len(color_attr.data) * 4, dtype=np.float32)
+    color_attr.data.foreach_get(prop, colors)
+    colors = colors.reshape(-1, 4)[:, :3]
+    if color_attr.domain == 'CORNER':
+        return colors
+    return colors[loop_vertices]
+
+
+def face_color_groups(arrays, loop_colors):
+    """
+    Group polygons by their average corner color, rounded to 3 decimals.
+
+    Returns (group_colors, face_groups): the rounded RGB tuples in order of
+    first appearance, and for each the ascending polygon indices using it.
+    """
+    num_polys = len(arrays.loop_starts)
+    if num_polys == 0:
+        return [], []
+
+    # Corners in polygon order, so each face is one contiguous run for reduceat
+    loop_order, offsets = arrays.face_loops(np.arange(num_polys))
+    sums = np.add.reduceat(loop_colors[loop_order].astype(np.float64), offsets, axis=0)
+    face_keys = round3(sums / arrays.loop_totals[:, None])
+
+    keys, first, inverse = np.unique(face_keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    appearance = np.argsort(first, kind='stable')
+
+    face_order = np.argsort(inverse, kind='stable')
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(keys)))
+    face_groups = np.split(face_order, bounds[:-1])
+
+    group_colors = [tuple(k / 1000.0 for k in keys[g].tolist()) for g in appearance]
+    return group_colors, [face_groups[g] for g in appearance]
+
+
+def build_group_mesh(mesh_data, arrays, face_indices):
+    """
+    Fill an empty mesh with the source polygons `face_indices`, straight
+    from index arrays.
+
+    Returns (used_vertices, group_loops, new_loop_vertices): the source
+    vertex of every new vertex, the source loop of every new loop and the
+    new vertex each new loop uses.
+    """
+    group_loops, offsets = arrays.face_loops(face_indices)
+    used_vertices, new_loop_vertices = np.unique(arrays.loop_vertices[group_loops], return_inverse=True)
+
+    mesh_data.vertices.add(len(used_vertices))
+    mesh_data.loops.add(len(group_loops))
+    mesh_data.polygons.add(len(face_indices))
+
+    mesh_data.vertices.foreach_set("co", arrays.positions[used_vertices].ravel())
+    mesh_data.loops.foreach_set("vertex_index", new_loop_vertices.ravel().astype(np.int32))
+    mesh_data.polygons.foreach_set("loop_start", offsets.astype(np.int32))
+
+    mesh_data.update(calc_edges=True)
+    return used_vertices, group_loops, new_loop_vertices.ravel()
+
+
+def build_joined_mesh(mesh_data, arrays, face_groups):
+    """
+    Build every color group into one mesh as disconnected parts: vertices
+    shared between groups are duplicated per group, exactly as if each group
+    had been its own object and they were joined afterwards.
+
+    Returns (face_indices, group_loops, new_loop_vertices, group_vertex_counts):
+    the source polygon of every new polygon, the source loop of every new
+    loop, the new vertex each new loop uses and how many vertices each group
+    got (they are stored group by group).
+    """
+    face_indices = np.concatenate(face_groups)
+    face_group = np.repeat(np.arange(len(face_groups)), [len(f) for f in face_groups])
+    group_loops, offsets = arrays.face_loops(face_indices)
+    loop_group = np.repeat(face_group, arrays.loop_totals[face_indices])
+
+    num_source_verts = max(len(arrays.positions), 1)
+    vertex_keys = loop_group * num_source_verts + arrays.loop_vertices[group_loops]
+    used_keys, new_loop_vertices = np.unique(vertex_keys, return_inverse=True)
+    new_loop_vertices = new_loop_vertices.ravel()
+    group_vertex_counts = np.bincount(used_keys // num_source_verts, minlength=len(face_groups))
+
+    mesh_data.vertices.add(len(used_keys))
+    mesh_data.loops.add(len(group_loops))
+    mesh_data.polygons.add(len(face_indices))
+
+    mesh_data.vertices.foreach_set("co", arrays.positions[used_keys % num_source_verts].ravel())
+    mesh_data.loops.foreach_set("vertex_index", new_loop_vertices.astype(np.int32))
+    mesh_data.polygons.foreach_set("loop_start", offsets.astype(np.int32))
+
+    mesh_data.update(calc_edges=True)
+    return face_indices, group_loops, new_loop_vertices, group_vertex_counts
+
+
+def cleanup_mesh(mesh_data, scene, timings, merge_groups=None):
+    """
+    Run the enabled cleanup stages on a split mesh in a single BMesh session:
+    merge by distance, limited dissolve, triangulate and edge split, in that
+    order. Seconds spent per stage are added to `timings`.
+
+    merge_groups: vertex counts of consecutive parts to merge separately (a
+    joined result), so separate color parts never merge into each other.
+    """
+    t_start = time.perf_counter()
+    bm = bmesh.new()
+    bm.from_mesh(mesh_data)
+    t_loaded = t_prev = time.perf_counter()
+
+    def lap(stage):
+        nonlocal t_prev
+        now = time.perf_counter()
+        timings[stage] = timings.get(stage, 0.0) + (now - t_prev)
+        t_prev = now
+
+    # --- Merge by Distance ---
+    if scene.merge_by_distance_after_separate:
+        if merge_groups is None:
+            bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=MERGE_DISTANCE)
+        else:
+            bm.verts.ensure_lookup_table()
+            verts = list(bm.verts)
+            end = 0
+            for count in merge_groups.tolist():
+                start, end = end, end + count
+                bmesh.ops.remove_doubles(bm, verts=verts[start:end], dist=MERGE_DISTANCE)
+        lap("merge")
+
+    # --- Limited Dissolve ---
+    if scene.limited_dissolve_after_separate:
+        bmesh.ops.dissolve_limited(
+            bm, angle_limit=DISSOLVE_ANGLE, use_dissolve_boundaries=False,
+            verts=bm.verts, edges=bm.edges, delimit={'NORMAL'},
+        )
+        lap("dissolve")
+
+    # --- Triangulate ---
+    if scene.triangulate_after_separate:
+        bmesh.ops.triangulate(bm, faces=bm.faces, quad_method='BEAUTY', ngon_method='BEAUTY')
+        lap("triangulate")
+
+    # --- Edge Split ---
+    if scene.edgesplit_after_separate:
+        edges_to_split = [e for e in bm.edges if len(e.link_faces) > 1]
+        if edges_to_split:
+            bmesh.ops.split_edges(bm, edges=edges_to_split)
+        lap("edge split")
+
+    bm.to_mesh(mesh_data)
+    mesh_data.update()
+    bm.free()
+    # BMesh conversion in and out
+    timings["convert"] = timings.get("convert", 0.0) + (t_loaded - t_start) + (time.perf_counter() - t_prev)
+
+
+def write_group_colors(mesh_data, domain, corner_colors, new_loop_vertices):
+    """Create the "Col" attribute of a split mesh from its corners' RGB."""
+    color_attr = mesh_data.color_attributes.new(name="Col", type='FLOAT_COLOR', domain=domain)
+    if domain == 'CORNER':
+        # Set colors for each loop (corner domain)
+        colors = np.ones((len(corner_colors), 4), dtype=np.float32)
+        colors[:, :3] = corner_colors
+    else:
+        # Set colors for each vertex (point domain): the average of the
+        # corners on it, carried over by index
+        colors = average_point_colors(new_loop_vertices, corner_colors, len(mesh_data.vertices))
+    color_attr.data.foreach_set("color", colors.ravel())
+
+
+def transfer_group_materials(mesh_data, source_materials, group_material_indices, hex_color, link, slots):
+    """
+    Add the materials a group's faces use to `mesh_data` and return the
+    faces' new material indices.
+
+    Linked materials are shared; otherwise each group gets its own copies.
+    `slots` maps materials already on the mesh to their slot, so a linked
+    material used by several groups of one mesh gets a single slot.
+    """
+    used_material_indices = np.unique(group_material_indices).tolist()
+    material_mapping = np.zeros(max(used_material_indices) + 1, dtype=np.int32)  # original -> new index
+
+    for orig_index in used_material_indices:
+        if orig_index < len(source_materials):
+            mat = source_materials[orig_index]
+            if not link:
+                # DON'T LINK MATERIALS: Create a copy of the material with a new name
+                original_mat = mat
+                mat = original_mat.copy()
+                mat.name = f"{original_mat.name} | {hex_color}"
+            if mat not in slots:
+                mesh_data.materials.append(mat)
+                slots[mat] = len(mesh_data.materials) - 1
+            material_mapping[orig_index] = slots[mat]
+
+    return material_mapping[group_material_indices]
+
+
+def average_point_colors(loop_vertices, loop_colors, num_verts):
+    """(V, 4) RGBA per vertex: the mean RGB of the corners using it, alpha 1."""
+    counts = np.bincount(loop_vertices, minlength=num_verts)
+    colors = np.ones((num_verts, 4), dtype=np.float32)
+    for channel in range(3):
+        sums = np.bincount(loop_vertices, weights=loop_colors[:, channel], minlength=num_verts)
+        colors[:, channel] = sums / np.maximum(counts, 1)
+    return colors
+
 
 class OBJECT_OT_separate_by_vertex_color(bpy.types.Operator):
     bl_idname = "object.separate_by_vertex_color"
@@ -39,240 +299,100 @@ class OBJECT_OT_separate_by_vertex_color(bpy.types.Operator):
             self.report({'ERROR'}, "Vertex color attribute 'Col' not found")
             return {'CANCELLED'}
 
-        bm = bmesh.new()
-        bm.from_mesh(obj.data)
-
-        loop_layer = None
-        if color_attr.domain == 'CORNER':
-            loop_layer = bm.loops.layers.color.get("Col")
-            if not loop_layer:
-                self.report({'ERROR'}, "Loop color layer 'Col' not found in BMesh")
-                return {'CANCELLED'}
-
-        def get_loop_color(loop):
-            if color_attr.domain == 'CORNER':
-                return loop[loop_layer][:3]
-            else:
-                idx = loop.vert.index
-                return color_attr.data[idx].color[:3]
-
-        # Group faces by average color AND their original material indices
-        color_faces = {}
-        for face in bm.faces:
-            colors = [get_loop_color(loop) for loop in face.loops]
-            avg_color = tuple(round(sum(c[i] for c in colors) / len(colors), 3) for i in range(3))
-            
-            # Store both the faces and their original material indices
-            if avg_color not in color_faces:
-                color_faces[avg_color] = {'faces': [], 'material_indices': []}
-            color_faces[avg_color]['faces'].append(face)
-            color_faces[avg_color]['material_indices'].append(face.material_index)
+        t_start = time.perf_counter()
+
+        # Group faces by average color
+        arrays = MeshArrays(obj.data)
+        loop_colors = loop_colors_rgb(color_attr, arrays.loop_vertices)
+        group_colors, face_groups = face_color_groups(arrays, loop_colors)
 
         created_objects = []
+        selected_domain = context.scene.vertex_color_domain
 
         # Check if original object has materials
         original_has_materials = len(obj.data.materials) > 0
-
-        transfer_warning_shown = False  
-
-        # Create new objects per color
-        for color, data in color_faces.items():
-            faces = data['faces']
-            material_indices = data['material_indices']
-            
-            hex_color = rgb_to_hex(color)
-            name_rgb = f"{int(color[0]*255)},{int(color[1]*255)},{int(color[2]*255)}"
-            obj_name = f"{obj.name} | {hex_color} | {name_rgb}"
-
-            new_mesh = bpy.data.meshes.new(obj_name)
+        transfer_materials = original_has_materials and context.scene.transfer_materials
+        link_materials = context.scene.link_materials
+        if context.scene.transfer_materials and not original_has_materials:
+            self.report({'WARNING'}, "Transfer Materials enabled but original model has no materials")
+        # If transfer_materials is FALSE: No materials on separated objects
+
+        joined = context.scene.join_after_separate and bool(face_groups)
+        if joined:
+            # --- Split and join in one build ---
+            # The joined result is built directly: each color group becomes a
+            # disconnected part of a single mesh, with no intermediate objects.
+            new_mesh = bpy.data.meshes.new(f"{obj.name} | Combined")
             new_obj = bpy.data.objects.new(new_mesh.name, new_mesh)
             context.collection.objects.link(new_obj)
             created_objects.append(new_obj)
             new_obj.matrix_world = obj.matrix_world.copy()
 
-            bm_new = bmesh.new()
-            vert_map = {}  # Maps original BMesh verts to new BMesh verts
-            loop_colors = []
-            new_face_material_indices = []  # Store material index for each new face
-
-            for i, face in enumerate(faces):
-                verts = []
-                face_colors = []
-                for loop in face.loops:
-                    v = loop.vert
-                    if v not in vert_map:
-                        vert_map[v] = bm_new.verts.new(v.co)
-                    verts.append(vert_map[v])
-                    face_colors.append(get_loop_color(loop))
-                try:
-                    new_face = bm_new.faces.new(verts)
-                    # Store the material index for this new face
-                    new_face_material_indices.append(material_indices[i])
-                except ValueError:
-                    pass
-                loop_colors.extend([(*c, 1.0) for c in face_colors])
-
-            bm_new.to_mesh(new_mesh)
-            bm_new.free()
-
-            # Use the selected domain for the new color attribute
-            selected_domain = context.scene.vertex_color_domain
-            new_color_attr = new_mesh.color_attributes.new(name="Col", type='FLOAT_COLOR', domain=selected_domain)
-            
-            if selected_domain == 'CORNER':
-                # Set colors for each loop (corner domain)
-                for i, col in enumerate(loop_colors):
-                    new_color_attr.data[i].color = col
-            else:
-                # Set colors for each vertex (point domain)
-                # Create a mapping from original vertices to their colors
-                vert_colors = {}
-                vert_color_counts = {}
-                
-                # Collect all colors for each original vertex
-                for face in faces:
-                    for loop in face.loops:
-                        orig_vert = loop.vert
-                        color = get_loop_color(loop)
-                        if orig_vert not in vert_colors:
-                            vert_colors[orig_vert] = [0, 0, 0]
-                            vert_color_counts[orig_vert] = 0
-                        vert_colors[orig_vert][0] += color[0]
-                        vert_colors[orig_vert][1] += color[1]
-                        vert_colors[orig_vert][2] += color[2]
-                        vert_color_counts[orig_vert] += 1
-                
-                # Average the colors for each original vertex and assign to new mesh vertices
-                bm_temp = bmesh.new()
-                bm_temp.from_mesh(new_mesh)
-                
-                # Create a mapping from position to original vertex
-                position_to_color = {}
-                for orig_vert, color_sum in vert_colors.items():
-                    count = vert_color_counts[orig_vert]
-                    avg_color = (
-                        color_sum[0] / count,
-                        color_sum[1] / count,
-                        color_sum[2] / count,
-                        1.0
+            face_indices, group_loops, new_loop_vertices, group_vertex_counts = build_joined_mesh(
+                new_mesh, arrays, face_groups
+            )
+            write_group_colors(new_mesh, selected_domain, loop_colors[group_loops], new_loop_vertices)
+
+            if transfer_materials:
+                slots = {}
+                new_material_indices = [
+                    transfer_group_materials(
+                        new_mesh, obj.data.materials, arrays.material_indices[group_faces],
+                        rgb_to_hex(color), link_materials, slots,
                     )
-                    # Use rounded position as key to avoid floating point precision issues
-                    pos_key = tuple(round(coord, 6) for coord in orig_vert.co)
-                    position_to_color[pos_key] = avg_color
-                
-                # Assign colors to new mesh vertices based on position
-                for i, vert in enumerate(bm_temp.verts):
-                    pos_key = tuple(round(coord, 6) for coord in vert.co)
-                    if pos_key in position_to_color:
-                        new_color_attr.data[i].color = position_to_color[pos_key]
-                    else:
-                        # Fallback: use default color
-                        new_color_attr.data[i].color = (1.0, 1.0, 1.0, 1.0)
-                
-                bm_temp.free()
-
-            # MATERIAL HANDLING: Based on transfer_materials and link_materials settings
-            if original_has_materials and context.scene.transfer_materials:
-                # Get unique material indices used by this specific object's faces
-                used_material_indices = set(new_face_material_indices)
-                
-                if context.scene.link_materials:
-                    # LINK MATERIALS: Share material references, but only add used materials
-                    material_mapping = {}  # Map original index to new index
-                    
-                    for orig_index in used_material_indices:
-                        if orig_index < len(obj.data.materials):
-                            mat = obj.data.materials[orig_index]
-                            new_obj.data.materials.append(mat)
-                            material_mapping[orig_index] = len(new_obj.data.materials) - 1
-                    
-                    # Assign the correct material indices to each face
-                    for poly_index, material_index in enumerate(new_face_material_indices):
-                        if (poly_index < len(new_mesh.polygons) and 
-                            material_index in material_mapping):
-                            new_mesh.polygons[poly_index].material_index = material_mapping[material_index]
-                
-                else:
-                    # DON'T LINK MATERIALS: Create new material copies, only for used materials
-                    material_mapping = {}  # Map original material indices to new material indices
-                    
-                    for orig_index in used_material_indices:
-                        if orig_index < len(obj.data.materials):
-                            original_mat = obj.data.materials[orig_index]
-                            # Create a copy of the material with a new name
-                            new_mat = original_mat.copy()
-                            new_mat.name = f"{original_mat.name} | {hex_color}"
-                            new_obj.data.materials.append(new_mat)
-                            material_mapping[orig_index] = len(new_obj.data.materials) - 1
-                    
-                    # Assign the new material index to the face
-                    for poly_index, material_index in enumerate(new_face_material_indices):
-                        if (poly_index < len(new_mesh.polygons) and 
-                            material_index in material_mapping):
-                            new_mesh.polygons[poly_index].material_index = material_mapping[material_index]
-
-            elif context.scene.transfer_materials and not original_has_materials and not transfer_warning_shown:
-                self.report({'WARNING'}, "Transfer Materials enabled but original model has no materials")
-                transfer_warning_shown = True
-
-            # If transfer_materials is FALSE: No materials on separated objects
-            # Do nothing - object will have no materials
+                    for color, group_faces in zip(group_colors, face_groups)
+                ]
+                new_mesh.polygons.foreach_set("material_index", np.concatenate(new_material_indices))
+        else:
+            # Create new objects per color
+            for color, face_indices in zip(group_colors, face_groups):
+                hex_color = rgb_to_hex(color)
+                name_rgb = f"{int(color[0]*255)},{int(color[1]*255)},{int(color[2]*255)}"
+                obj_name = f"{obj.name} | {hex_color} | {name_rgb}"
+
+                new_mesh = bpy.data.meshes.new(obj_name)
+                new_obj = bpy.data.objects.new(new_mesh.name, new_mesh)
+                context.collection.objects.link(new_obj)
+                created_objects.append(new_obj)
+                new_obj.matrix_world = obj.matrix_world.copy()
+
+                used_vertices, group_loops, new_loop_vertices = build_group_mesh(new_mesh, arrays, face_indices)
+
+                # Use the selected domain for the new color attribute
+                write_group_colors(new_mesh, selected_domain, loop_colors[group_loops], new_loop_vertices)
+
+                # MATERIAL HANDLING: Based on transfer_materials and link_materials settings
+                if transfer_materials:
+                    new_mesh.polygons.foreach_set("material_index", transfer_group_materials(
+                        new_mesh, obj.data.materials, arrays.material_indices[face_indices],
+                        hex_color, link_materials, {},
+                    ))
+
+        t_split = time.perf_counter()
 
         # Hide original
         obj.hide_set(True)
         obj.hide_render = True
 
-        # --- Processing order ---
+        # --- Cleanup: one BMesh session per object, no mode switching ---
+        # The joined result merges by distance per color part, as if each part
+        # had been cleaned up as its own object before joining.
+        timings = {"split": t_split - t_start}
+        merge_groups = group_vertex_counts if joined else None
+        scene = context.scene
+        run_cleanup = (
+            scene.merge_by_distance_after_separate or scene.limited_dissolve_after_separate
+            or scene.triangulate_after_separate or scene.edgesplit_after_separate
+        )
         for new_obj in created_objects:
-            bpy.context.view_layer.objects.active = new_obj
             new_obj.select_set(True)
+            if run_cleanup:
+                cleanup_mesh(new_obj.data, scene, timings, merge_groups)
+        if created_objects:
+            context.view_layer.objects.active = created_objects[0]
 
-            # --- Merge by Distance ---
-            if context.scene.merge_by_distance_after_separate:
-                bm_merge = bmesh.new()
-                bm_merge.from_mesh(new_obj.data)
-                bmesh.ops.remove_doubles(bm_merge, verts=bm_merge.verts, dist=0.0001)
-                bm_merge.to_mesh(new_obj.data)
-                new_obj.data.update()
-                bm_merge.free()
-
-            # --- Limited Dissolve ---
-            if context.scene.limited_dissolve_after_separate:
-                bpy.ops.object.mode_set(mode='EDIT')
-                bpy.ops.mesh.select_all(action='SELECT')
-                bpy.ops.mesh.dissolve_limited(angle_limit=math.radians(5.0))  # 5 degrees default
-                bpy.ops.object.mode_set(mode='OBJECT')
-
-        # --- Join objects ---
-        if context.scene.join_after_separate and created_objects:
-            bpy.ops.object.select_all(action='DESELECT')
-            for o in created_objects:
-                o.select_set(True)
-            bpy.context.view_layer.objects.active = created_objects[0]
-            bpy.ops.object.join()
-            combined_obj = context.active_object
-            combined_obj.name = f"{obj.name} | Combined"
-            created_objects = [combined_obj]
-
-        # --- Triangulate ---
-        if context.scene.triangulate_after_separate:
-            bpy.ops.object.mode_set(mode='EDIT')
-            bpy.ops.mesh.select_all(action='SELECT')
-            bpy.ops.mesh.quads_convert_to_tris()
-            bpy.ops.object.mode_set(mode='OBJECT')
-
-        # --- Edge Split ---
-        if context.scene.edgesplit_after_separate:
-            bm_split = bmesh.new()
-            bm_split.from_mesh(created_objects[0].data)
-            edges_to_split = [e for e in bm_split.edges if len(e.link_faces) > 1]
-            if edges_to_split:
-                bmesh.ops.split_edges(bm_split, edges=edges_to_split)
-                bm_split.to_mesh(created_objects[0].data)
-            bm_split.free()
-
-        bm.free()
-        self.report({'INFO'}, f"Separated mesh into {len(created_objects)} object(s) by vertex color.")
+        stage_times = ", ".join(f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in timings.items())
+        self.report({'INFO'}, f"Separated mesh into {len(created_objects)} object(s) by vertex color ({stage_times}).")
         return {'FINISHED'}
 
 class VIEW3D_PT_separate_by_vertex_color_panel(bpy.types.Panel):
@@ -0,0 +1,314 @@
+"""Tests for the bpy-free SWToolkit.formats package, on synthetic .anim files."""
+
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from SWToolkit.formats import anim, batch, cache, optimize
+
+
+# --------------------------
+# Synthetic files
+# --------------------------
+BONES = (
+    # name, head offset (file space), parent, children
+    ("root", (0.0, 0.0, 0.0), anim.NO_PARENT, [1, 2]),
+    ("spine", (0.0, 1.0, 0.0), 0, [3]),
+    ("hip", (0.5, -1.0, 0.25), 0, []),
+    ("head", (0.0, 0.5, 0.1), 1, []),
+)
+ANIMATION_BYTES = b"\x01\x02\x03 opaque animation data \xff"
+
+
+def bone_table(bones=BONES):
+    out = [struct.pack("<I", len(bones))]
+    for name, head, parent, children in bones:
+        matrix = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, *head]
+        out.append(struct.pack("<H", len(name)) + name.encode('ascii'))
+        out.append(struct.pack("<12f", *matrix))
+        out.append(struct.pack("<II", parent, len(children)))
+        out.extend(struct.pack("<I", c) for c in children)
+    return b''.join(out)
+
+
+def make_vertices(count, seed):
+    rng = np.random.default_rng(seed)
+    vertices = np.zeros(count, dtype=anim.ANIM_VERTEX_DTYPE)
+    vertices['pos'] = rng.uniform(-2, 2, (count, 3))
+    vertices['color'] = rng.integers(0, 256, (count, 4))
+    vertices['uv'] = rng.uniform(0, 1, (count, 2))
+    vertices['normal'] = rng.uniform(-1, 1, (count, 3))
+    vertices['bones'] = rng.integers(0, len(BONES), (count, 2))
+    vertices['weights'] = rng.uniform(0, 1, (count, 2))
+    return vertices
+
+
+def make_triangles(count, vertex_count, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, vertex_count, (count, 3)).astype('<u4')
+
+
+def anim_bytes(file_unknown, submeshes, tail):
+    """Encode a file by hand, independently of anim.write()."""
+    out = [struct.pack("<4sII", b'anim', file_unknown, len(submeshes))]
+    for header, vertices, triangles, vertex_extra, triangle_extra in submeshes:
+        vertex_section = vertices.tobytes() + vertex_extra
+        triangle_section = triangles.tobytes() + triangle_extra
+        out.append(header)
+        out.append(struct.pack("<I", len(vertex_section)) + vertex_section)
+        out.append(struct.pack("<I", len(triangle_section)) + triangle_section)
+    out.append(tail)
+    return b''.join(out)
+
+
+def sample_submeshes():
+    return [
+        (b"HEADER-000", make_vertices(6, 1), make_triangles(4, 6, 2), b'', b''),
+        # Trailing bytes that don't form a whole record must survive a rewrite
+        (b"HEADER-001", make_vertices(5, 3), make_triangles(3, 5, 4), b'\x07' * 7, b'\x05' * 5),
+    ]
+
+
+@pytest.fixture
+def anim_path(tmp_path):
+    path = tmp_path / "sample.anim"
+    path.write_bytes(anim_bytes(0x1234, sample_submeshes(), bone_table() + ANIMATION_BYTES))
+    return str(path)
+
+
+# --------------------------
+# read / write
+# --------------------------
+def test_read_parses_sections(anim_path):
+    data = anim.read(anim_path)
+    expected = sample_submeshes()
+    assert data.file_unknown == 0x1234
+    assert len(data.submeshes) == len(expected)
+    for sm, (header, vertices, triangles, vertex_extra, triangle_extra) in zip(data.submeshes, expected):
+        assert sm.header == header
+        assert sm.vertices.tobytes() == vertices.tobytes()
+        np.testing.assert_array_equal(sm.triangles, triangles)
+        assert sm.vertex_extra == vertex_extra
+        assert sm.triangle_extra == triangle_extra
+    assert data.skeleton.names == [b[0] for b in BONES]
+
+
+def test_write_round_trips_bytes(anim_path, tmp_path):
+    out_path = str(tmp_path / "copy.anim")
+    anim.write(anim.read(anim_path), out_path)
+    with open(anim_path, 'rb') as a, open(out_path, 'rb') as b:
+        assert a.read() == b.read()
+
+
+def test_write_round_trips_zero_submeshes(tmp_path):
+    path = tmp_path / "empty.anim"
+    original = anim_bytes(7, [], bone_table() + ANIMATION_BYTES)
+    path.write_bytes(original)
+
+    data = anim.read(str(path))
+    assert data.submeshes == []
+    out_path = tmp_path / "copy.anim"
+    anim.write(data, str(out_path))
+    assert out_path.read_bytes() == original
+
+    arrays = anim.to_mesh_arrays(data)
+    assert arrays.submesh_count == 0
+    assert arrays.positions.shape == (0, 3)
+    assert arrays.triangles.shape == (0, 3)
+
+
+def test_write_replaces_existing_file(anim_path, tmp_path):
+    out_path = tmp_path / "copy.anim"
+    out_path.write_bytes(b"old contents")
+    anim.write(anim.read(anim_path), str(out_path))
+    assert out_path.read_bytes()[:4] == b'anim'
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="POSIX permissions")
+def test_write_file_modes(anim_path, tmp_path):
+    data = anim.read(anim_path)
+    new_path = tmp_path / "new.anim"
+    anim.write(data, str(new_path))
+    assert new_path.stat().st_mode & 0o777 == anim.DEFAULT_FILE_MODE
+
+    os.chmod(new_path, 0o640)
+    anim.write(data, str(new_path))
+    assert new_path.stat().st_mode & 0o777 == 0o640
+
+
+def test_read_rejects_truncated_file(anim_path, tmp_path):
+    with open(anim_path, 'rb') as f:
+        data = f.read()
+    path = tmp_path / "truncated.anim"
+    path.write_bytes(data[:60])
+    with pytest.raises(ValueError):
+        anim.read(str(path))
+
+
+# --------------------------
+# Blender-space conversion
+# --------------------------
+def test_to_mesh_arrays_axes_and_winding(anim_path):
+    data = anim.read(anim_path)
+    arrays = anim.to_mesh_arrays(data)
+    first, second = data.submeshes
+
+    pos = np.concatenate((first.vertices['pos'], second.vertices['pos']))
+    x, y, z = pos.T
+    np.testing.assert_allclose(arrays.positions, np.stack((-x, -z, y), axis=1))
+    np.testing.assert_allclose(arrays.positions @ anim.BLENDER_TO_SW.T, pos)
+
+    # Winding is reversed and the second submesh's indices are offset
+    expected = np.concatenate((
+        first.triangles[:, (0, 2, 1)],
+        second.triangles[:, (0, 2, 1)] + len(first.vertices),
+    ))
+    np.testing.assert_array_equal(arrays.triangles, expected)
+    np.testing.assert_array_equal(
+        arrays.material_indices, [0] * len(first.triangles) + [1] * len(second.triangles)
+    )
+
+    color = np.concatenate((first.vertices['color'], second.vertices['color']))
+    np.testing.assert_allclose(arrays.colors[:, 3], color[:, 3] / 255.0)
+    np.testing.assert_array_equal(
+        anim.linear_to_srgb(arrays.colors[:, :3]), color[:, :3]
+    )
+    assert arrays.submesh_headers == [first.header, second.header]
+
+
+# --------------------------
+# Skeleton
+# --------------------------
+def recursive_heads_tails(skeleton):
+    """The importer's original per-bone recursion, for comparison."""
+    local = skeleton.matrices[:, 9:12] @ anim.SW_TO_BLENDER.T
+    heads = {}
+
+    def head(bi):
+        if bi not in heads:
+            parent = int(skeleton.parents[bi])
+            heads[bi] = local[bi] if parent == anim.NO_PARENT else head(parent) + local[bi]
+        return heads[bi]
+
+    tails = []
+    for bi, children in enumerate(skeleton.children):
+        if children:
+            tails.append(np.mean([head(c) for c in children], axis=0))
+        else:
+            tails.append(head(bi) + np.array((0.0, -0.05, 0.0)))
+    return np.array([head(bi) for bi in range(len(skeleton))]), np.array(tails)
+
+
+def test_bone_heads_tails_match_recursion(anim_path):
+    skeleton = anim.read(anim_path).skeleton
+    heads, tails = anim.bone_heads_tails(skeleton)
+    expected_heads, expected_tails = recursive_heads_tails(skeleton)
+    np.testing.assert_allclose(heads, expected_heads, atol=1e-6)
+    np.testing.assert_allclose(tails, expected_tails, atol=1e-6)
+
+
+def test_bone_heads_tails_rejects_cycle():
+    bones = (
+        ("root", (0.0, 0.0, 0.0), anim.NO_PARENT, []),
+        ("a", (1.0, 0.0, 0.0), 2, [2]),
+        ("b", (0.0, 1.0, 0.0), 1, [1]),
+    )
+    skeleton = anim.read_skeleton(bone_table(bones))
+    with pytest.raises(ValueError, match="cycle"):
+        anim.bone_heads_tails(skeleton)
+
+
+# --------------------------
+# Cache
+# --------------------------
+def assert_mesh_arrays_equal(a, b):
+    assert a.file_unknown == b.file_unknown
+    assert a.submesh_headers == b.submesh_headers
+    for name in ('positions', 'triangles', 'material_indices', 'colors', 'vertex_bones', 'vertex_weights'):
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+    assert a.skeleton.fingerprint() == b.skeleton.fingerprint()
+    assert a.skeleton.size == b.skeleton.size
+
+
+def test_anim_cache_store_load(anim_path, tmp_path):
+    anim_cache = cache.AnimCache(str(tmp_path / "cache"))
+    key = anim_cache.key(anim_path)
+    assert anim_cache.load(key) is None
+
+    arrays = anim.read_mesh_arrays(anim_path)
+    anim_cache.store(key, arrays)
+    assert_mesh_arrays_equal(anim_cache.load(key), arrays)
+    assert_mesh_arrays_equal(cache.read_mesh_arrays_cached(anim_path, anim_cache), arrays)
+
+
+def test_anim_cache_drops_corrupt_entry(anim_path, tmp_path):
+    anim_cache = cache.AnimCache(str(tmp_path / "cache"))
+    key = anim_cache.key(anim_path)
+    arrays = anim.read_mesh_arrays(anim_path)
+    anim_cache.store(key, arrays)
+
+    entry_path = os.path.join(anim_cache.directory, key + cache.ENTRY_SUFFIX)
+    with open(entry_path, 'rb') as f:
+        data = f.read()
+    with open(entry_path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+
+    assert anim_cache.load(key) is None
+    assert not os.path.exists(entry_path)
+    assert_mesh_arrays_equal(cache.read_mesh_arrays_cached(anim_path, anim_cache), arrays)
+    assert_mesh_arrays_equal(anim_cache.load(key), arrays)
+
+
+# --------------------------
+# Batch decoding
+# --------------------------
+def test_decode_many_falls_back_when_workers_cannot_start(anim_path, tmp_path, monkeypatch):
+    popen_spawn = pytest.importorskip("multiprocessing.popen_spawn_posix")
+
+    def launch(self, process_obj):
+        raise FileNotFoundError("no interpreter to spawn")
+
+    monkeypatch.setattr(popen_spawn.Popen, "_launch", launch)
+    missing = str(tmp_path / "missing.anim")
+    results = {path: (arrays, error) for path, arrays, error in batch.decode_many([anim_path, missing], max_workers=2)}
+
+    assert_mesh_arrays_equal(results[anim_path][0], anim.read_mesh_arrays(anim_path))
+    assert results[anim_path][1] is None
+    assert results[missing][0] is None
+    assert isinstance(results[missing][1], OSError)
+
+
+# --------------------------
+# Vertex cache optimization
+# --------------------------
+def grid_triangles(size, seed):
+    rows = np.arange(size * size).reshape(size, size)
+    a, b = rows[:-1, :-1].ravel(), rows[:-1, 1:].ravel()
+    c, d = rows[1:, :-1].ravel(), rows[1:, 1:].ravel()
+    triangles = np.concatenate((np.stack((a, b, c), 1), np.stack((b, d, c), 1)))
+    return triangles[np.random.default_rng(seed).permutation(len(triangles))].astype('<u4')
+
+
+def test_optimize_indexed_keeps_triangles():
+    triangles = grid_triangles(24, 5)
+    vertex_count = 24 * 24
+    ids = np.arange(vertex_count)
+
+    new_ids, new_triangles, stats = optimize.optimize_indexed(ids, triangles)
+
+    assert sorted(map(tuple, new_ids[new_triangles].tolist())) == sorted(map(tuple, triangles.tolist()))
+    assert sorted(new_ids.tolist()) == ids.tolist()
+    assert new_triangles.dtype == triangles.dtype
+    assert stats['acmr_after'] < stats['acmr_before']
+
+
+def test_optimize_indexed_is_deterministic():
+    triangles = grid_triangles(12, 6)
+    vertices = make_vertices(144, 7)
+    first = optimize.optimize_indexed(vertices, triangles)
+    second = optimize.optimize_indexed(vertices, triangles)
+    assert first[0].tobytes() == second[0].tobytes()
+    np.testing.assert_array_equal(first[1], second[1])